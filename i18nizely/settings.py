@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from datetime import timedelta
 import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -142,7 +143,7 @@ AUTH_USER_MODEL = 'users.User'
 # Every endpoint is secure with authentication
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -167,4 +168,28 @@ CHANNEL_LAYERS = {
         #     "hosts": [("127.0.0.1", 6379)],
         # },
     },
-}
\ No newline at end of file
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', # only for development
+        # 'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        # 'LOCATION': 'redis://127.0.0.1:6379',
+    },
+}
+
+BACKGROUND_WORKERS = 4
+
+IMPORT_JOB_ROOT = os.path.join(tempfile.gettempdir(), 'i18nizely', 'imports')
+
+ROLE_CACHE_TIMEOUT = 5 * 60
+WS_ROLE_RECHECK_INTERVAL = 60
+USER_CACHE_TIMEOUT = 60
+
+LANGUAGE_REMOVAL_BACKGROUND_THRESHOLD = 50000
+LANGUAGE_REMOVAL_CHUNK_SIZE = 5000
+
+EXPORT_WORKERS = 4
+
+EXPORT_CACHE_TIMEOUT = 60 * 60
+EXPORT_CACHE_MAX_SIZE = 10 * 1024 * 1024
\ No newline at end of file
@@ -22,8 +22,8 @@ from rest_framework_nested.routers import DefaultRouter, NestedDefaultRouter
 
 from users.views import NotificationViewSet, UserViewSet
 from projects.views import ProjectViewSet, CollaboratorViewSet, RecordViewSet
-from keys.views import KeyViewSet
-from translations.views import TranslationViewSet, VersionViewSet, CommentViewSet
+from keys.views import KeyGridViewSet, KeyViewSet
+from translations.views import TranslationSearchViewSet, TranslationViewSet, VersionViewSet, CommentViewSet
 
 
 router = DefaultRouter()
@@ -35,6 +35,8 @@ project_router = NestedDefaultRouter(router, r'projects', lookup='project')
 project_router.register(r'collaborators', CollaboratorViewSet, basename='project-collaborators')
 project_router.register(r'record', RecordViewSet, basename='project-record')
 project_router.register(r'keys', KeyViewSet, basename='project-keys')
+project_router.register(r'grid', KeyGridViewSet, basename='project-grid')
+project_router.register(r'search', TranslationSearchViewSet, basename='project-search')
 
 key_router = NestedDefaultRouter(project_router, r'keys', lookup='key')
 key_router.register(r'translations', TranslationViewSet, basename='key-translations')
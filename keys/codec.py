@@ -0,0 +1,22 @@
+from functools import lru_cache
+
+
+@lru_cache(maxsize=65536)
+def decode_segment(segment: str) -> str:
+    if segment == segment.lower():
+        return segment
+    return ''.join('-' + c.lower() if c.isupper() else c.lower() for c in segment)
+
+
+@lru_cache(maxsize=65536)
+def encode_segment(segment: str) -> str:
+    words = segment.split('-')
+    return words[0] + ''.join(word[:1].upper() + word[1:] for word in words[1:])
+
+
+def key_from_arb(key: str) -> str:
+    return '.'.join(map(decode_segment, key.split('_')))
+
+
+def arb_from_key(name: str) -> str:
+    return '_'.join(map(encode_segment, name.split('.')))
@@ -0,0 +1,218 @@
+import json, hashlib, os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, groupby
+from multiprocessing import get_context
+from operator import itemgetter
+from tempfile import NamedTemporaryFile, SpooledTemporaryFile
+from zipfile import ZipFile
+import django
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections
+from django.db.models import CharField, OuterRef, Subquery, Value
+from django.db.models.functions import Collate
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, quote_etag
+
+from projects.models import Project
+from translations.models import Translation
+from .writers import writers
+
+
+SPOOL_SIZE = 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+executor = None
+
+
+def export_rows(project_id: int, languages: list, only_reviewed: bool, source_language: str = None):
+    translations = Translation.objects.filter(key__project=project_id, language__in=languages).exclude(text='')
+    if only_reviewed:
+        translations = translations.filter(is_reviewed=True)
+    if source_language:
+        source = Subquery(Translation.objects.filter(key=OuterRef('key'), language=source_language).values('text')[:1])
+    else:
+        source = Value(None, output_field=CharField())
+    return translations.annotate(source=source).order_by('language', Collate('key__name', 'C')).values_list(
+        'key__name', 'language', 'text', 'is_reviewed', 'source'
+    ).iterator(chunk_size=2000)
+
+
+def get_source_language(project: Project, file_types: list) -> str:
+    if any(writers[type].needs_source for type in file_types):
+        return project.main_language
+    return None
+
+
+def render_files(lang: str, rows, file_types: list, source_language: str = None, spool: bool = True) -> list:
+    if spool:
+        files = {type: SpooledTemporaryFile(max_size=SPOOL_SIZE) for type in file_types}
+    else:
+        files = {type: NamedTemporaryFile(delete=False) for type in file_types}
+    file_writers = [writers[type](files[type], lang, source_language) for type in file_types]
+    for writer in file_writers:
+        writer.start()
+    for name, _, text, _, source in rows:
+        for writer in file_writers:
+            writer.add(name, text, source)
+    for writer in file_writers:
+        writer.end()
+    for file in files.values():
+        file.seek(0)
+    return [(f'{lang}.{type}', file) for type, file in files.items()]
+
+
+def render_language(project_id: int, lang: str, file_types: list, only_reviewed: bool, source_language: str = None) -> list:
+    close_old_connections()
+    rows = iter(export_rows(project_id, [lang], only_reviewed, source_language))
+    first = next(rows, None)
+    if first is None:
+        return []
+    files = render_files(lang, chain([first], rows), file_types, source_language, spool=False)
+    for _, file in files:
+        file.close()
+    return [(name, file.name) for name, file in files]
+
+
+def open_rendered(paths: list):
+    paths = deque(paths)
+    try:
+        while paths:
+            name, path = paths[0]
+            file = open(path, 'rb')
+            os.unlink(path)
+            paths.popleft()
+            yield name, file
+    finally:
+        for _, path in paths:
+            os.unlink(path)
+
+
+def remove_rendered(future):
+    if not future.cancelled() and not future.exception():
+        for _, path in future.result():
+            os.unlink(path)
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global executor
+    if not executor:
+        executor = ProcessPoolExecutor(max_workers=settings.EXPORT_WORKERS, mp_context=get_context('spawn'), initializer=django.setup)
+    return executor
+
+
+def iter_files(project: Project, languages: list, file_types: list, only_reviewed: bool):
+    file_types = [type for type in dict.fromkeys(file_types) if type in writers]
+    if not file_types:
+        return
+    source_language = get_source_language(project, file_types)
+    languages = sorted(set(languages))
+    workers = min(settings.EXPORT_WORKERS, len(languages))
+    if workers <= 1:
+        for lang, rows in groupby(export_rows(project.id, languages, only_reviewed, source_language), key=itemgetter(1)):
+            yield from render_files(lang, rows, file_types, source_language)
+        return
+    futures = deque()
+    try:
+        for lang in languages:
+            futures.append(get_executor().submit(render_language, project.id, lang, file_types, only_reviewed, source_language))
+            if len(futures) >= workers:
+                yield from open_rendered(futures.popleft().result())
+        while futures:
+            yield from open_rendered(futures.popleft().result())
+    finally:
+        for future in futures:
+            future.cancel()
+            future.add_done_callback(remove_rendered)
+
+
+class ZipStream:
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def stream_zip(files):
+    stream = ZipStream()
+    with ZipFile(stream, 'w') as writer:
+        for name, file in files:
+            with file, writer.open(name, 'w') as entry:
+                for data in iter(lambda: file.read(CHUNK_SIZE), b''):
+                    entry.write(data)
+                    if stream.chunks:
+                        yield stream.drain()
+    yield stream.drain()
+
+
+async def stream_async(chunks):
+    iterator = iter(chunks)
+    while True:
+        chunk = await sync_to_async(next)(iterator, None)
+        if chunk is None:
+            break
+        yield chunk
+
+
+def export_etag(project: Project, languages: list, file_types: list, only_reviewed: bool) -> str:
+    params = json.dumps([sorted(languages), file_types, only_reviewed, project.main_language])
+    digest = hashlib.md5(params.encode('utf-8')).hexdigest()
+    return f'{project.id}-{project.revision}-{digest}'
+
+
+def cache_chunks(chunks, cache_key: str):
+    cached = []
+    size = 0
+    for chunk in chunks:
+        if cached is not None:
+            size += len(chunk)
+            if size > settings.EXPORT_CACHE_MAX_SIZE:
+                cached = None
+            else:
+                cached.append(chunk)
+        yield chunk
+    if cached is not None:
+        cache.set(cache_key, b''.join(cached), settings.EXPORT_CACHE_TIMEOUT)
+
+
+def zip_response(request, files, filename: str, etag: str):
+    response = get_conditional_response(request, etag=quote_etag(etag))
+    if response:
+        return response
+    cache_key = f'export_{etag}'
+    content = cache.get(cache_key)
+    if content is not None:
+        if not content:
+            return None
+        response = HttpResponse(content, content_type='application/zip')
+    else:
+        files = iter(files)
+        first = next(files, None)
+        if first is None:
+            cache.set(cache_key, b'', settings.EXPORT_CACHE_TIMEOUT)
+            return None
+        chunks = cache_chunks(stream_zip(chain([first], files)), cache_key)
+        if isinstance(request._request, ASGIRequest):
+            chunks = stream_async(chunks)
+        response = StreamingHttpResponse(chunks, content_type='application/zip')
+    response['ETag'] = quote_etag(etag)
+    response['Content-Disposition'] = f'attachment; filename="{filename}.zip"'
+    return response
@@ -0,0 +1,147 @@
+from datetime import datetime
+from django.db import transaction
+
+from projects.audit import AuditLog
+from projects.models import Contribution, Project, Record
+from translations.models import Translation, Version
+from users.models import User
+from .models import Key
+
+
+class KeyImporter:
+    batch_size = 1000
+    name_length = Key._meta.get_field('name').max_length
+
+    def __init__(self, project: Project, user: User, dry_run: bool = False, audit_log: AuditLog = None):
+        self.project = project
+        self.user = user
+        self.dry_run = dry_run
+        self.audit_log = audit_log or AuditLog()
+        self.languages = {language.code: language for language in project.languages.all()}
+        self.keys = dict(project.keys.values_list('name', 'id'))
+        self.translations = {}
+        self.new_keys = {}
+        self.new_translations = {}
+        self.updated_translations = {}
+        self.versions = []
+        self.changed = {}
+        self.unreviewed = []
+        self.saved_keys = set()
+        self.translation_counts = dict.fromkeys(self.languages, 0)
+        self.reviewed_counts = dict.fromkeys(self.languages, 0)
+
+    def get_translations(self, lang: str) -> dict:
+        if lang not in self.translations:
+            translations = Translation.objects.filter(key__project=self.project, language=lang).values_list(
+                'key__name', 'id', 'text', 'is_reviewed', 'created_by', 'updated_at'
+            )
+            self.translations[lang] = {name: values for name, *values in translations}
+        return self.translations[lang]
+
+    def add(self, lang: str, entries):
+        translations = self.get_translations(lang)
+        for key_name, text in entries:
+            key = self.keys.get(key_name) or self.new_keys.get(key_name)
+            if not key:
+                if len(key_name) > self.name_length:
+                    raise ValueError(f'Key name \'{key_name[:50]}...\' is longer than {self.name_length} characters.')
+                key = Key(name=key_name, project=self.project, created_by=self.user)
+                self.new_keys[key_name] = key
+            translation = translations.get(key_name)
+            new_translation = self.new_translations.get((lang, key_name))
+            if translation:
+                if translation[1] == text:
+                    continue
+                self.update_translation(lang, key_name, translation, text)
+            elif new_translation:
+                if new_translation.text == text:
+                    continue
+                new_translation.text = text
+            else:
+                translation = Translation(text=text, language=lang, created_by=self.user)
+                if isinstance(key, Key):
+                    translation.key = key
+                else:
+                    translation.key_id = key
+                self.new_translations[(lang, key_name)] = translation
+                self.translation_counts[lang] += 1
+            self.saved_keys.add(key_name)
+            if not self.dry_run and len(self.new_translations) + len(self.updated_translations) >= self.batch_size:
+                self.flush()
+
+    def update_translation(self, lang: str, key_name: str, current: tuple, text: str):
+        id, old_text, is_reviewed, created_by_id, updated_at = current
+        translation = self.updated_translations.get(id)
+        if not translation:
+            self.versions.append(Version(
+                text=old_text,
+                translation_id=id,
+                created_by_id=created_by_id,
+                created_at=updated_at
+            ))
+            translation = Translation(id=id)
+            self.updated_translations[id] = translation
+        if is_reviewed:
+            self.reviewed_counts[lang] -= 1
+            if self.dry_run:
+                self.unreviewed.append({'key': key_name, 'language': lang})
+        if self.dry_run:
+            self.changed.setdefault((lang, key_name), {'key': key_name, 'language': lang, 'old_text': old_text})['new_text'] = text
+        translation.text = text
+        translation.is_reviewed = False
+        translation.reviewed_at = None
+        translation.reviewed_by = None
+        translation.updated_at = datetime.now()
+        self.translations[lang][key_name] = (id, text, False, created_by_id, translation.updated_at)
+
+    def diff(self) -> dict:
+        new_keys = list(self.new_keys)
+        new_translations = [
+            {'key': key_name, 'language': lang, 'text': trans.text}
+            for (lang, key_name), trans in self.new_translations.items()
+        ]
+        changed = list(self.changed.values())
+        return {
+            'new_keys': {'count': len(new_keys), 'keys': new_keys},
+            'new_translations': {'count': len(new_translations), 'translations': new_translations},
+            'changed': {'count': len(changed), 'translations': changed},
+            'unreviewed': {'count': len(self.unreviewed), 'translations': self.unreviewed},
+        }
+
+    def flush(self):
+        with transaction.atomic():
+            # Deltas point at the text saved next, so the rows are locked and versions take their current values.
+            current = Translation.objects.select_for_update().filter(id__in=self.updated_translations).order_by('id')
+            current = {id: values for id, *values in current.values_list('id', 'text', 'created_by', 'updated_at')}
+            chains = Version.latest_chains(self.updated_translations.keys())
+            for version in self.versions:
+                version.text, version.created_by_id, version.created_at = current[version.translation_id]
+                version.compress(self.updated_translations[version.translation_id].text, chains.get(version.translation_id, 0))
+            Key.objects.bulk_create(self.new_keys.values(), batch_size=self.batch_size)
+            Translation.objects.bulk_create(self.new_translations.values(), batch_size=self.batch_size)
+            Version.objects.bulk_create(self.versions, batch_size=self.batch_size)
+            Translation.objects.bulk_update(
+                self.updated_translations.values(),
+                ['text', 'is_reviewed', 'reviewed_at', 'reviewed_by', 'updated_at'],
+                batch_size=self.batch_size
+            )
+        for key_name, key in self.new_keys.items():
+            self.keys[key_name] = key.id
+        for (lang, key_name), trans in self.new_translations.items():
+            self.translations[lang][key_name] = (trans.id, trans.text, False, trans.created_by_id, trans.updated_at)
+        self.new_keys = {}
+        self.new_translations = {}
+        self.updated_translations = {}
+        self.versions = []
+
+    def save(self) -> list:
+        with transaction.atomic():
+            self.flush()
+            self.audit_log.add(Record.Type.IMPORT_KEYS, self.user, self.project, count=len(self.saved_keys), merge=True)
+            Contribution.add(self.user, self.project, translation_count=sum(self.translation_counts.values()))
+            for lang, language in self.languages.items():
+                if self.translation_counts[lang] or self.reviewed_counts[lang]:
+                    language.update_counts(self.translation_counts[lang], self.reviewed_counts[lang])
+            if self.saved_keys:
+                self.project.advance_revision()
+        return [self.keys[key_name] for key_name in self.saved_keys]
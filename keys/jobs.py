@@ -0,0 +1,100 @@
+import logging
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from projects import notifications
+from projects.models import Project
+from projects.serializers import LanguageSerializer
+from users.models import User
+from utils.worker_util import WorkerUtil
+from .importer import KeyImporter
+from .models import ImportJob, Key
+from .parsers import iter_json_entries
+from .serializers import ImportJobSerializer, KeySerializer
+
+logger = logging.getLogger(__name__)
+
+job_storage = FileSystemStorage(location=settings.IMPORT_JOB_ROOT, file_permissions_mode=0o600, directory_permissions_mode=0o700)
+
+
+def send_notification(project_id: int, type: str, data, after_commit: bool = True):
+    notifications.send_notification(project_id, f'key.{type}', data, after_commit)
+
+
+def create_import_job(project: Project, user: User, files) -> ImportJob:
+    languages = project.get_language_codes()
+    with transaction.atomic():
+        job = ImportJob.objects.create(project=project, created_by=user)
+        try:
+            for lang in files:
+                if lang in languages:
+                    job.files[lang] = job_storage.save(f'{job.id}/{lang}.json', files[lang])
+        except Exception:
+            for path in job.files.values():
+                job_storage.delete(path)
+            raise
+        job.total = len(job.files)
+        job.save()
+        transaction.on_commit(lambda: WorkerUtil.submit(run_import_job, job.id))
+    return job
+
+
+def update_import_job(job: ImportJob, **fields):
+    for attr, value in fields.items():
+        setattr(job, attr, value)
+    job.save()
+    send_notification(project_id=job.project_id, type='import_job', data=ImportJobSerializer(job).data, after_commit=False)
+
+
+def update_import_progress(job: ImportJob, connection, processed: int):
+    # The import runs in one transaction, so progress goes through its own connection to stay visible while polling.
+    job.processed = processed
+    job.updated_at = timezone.now()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {ImportJob._meta.db_table} SET processed = %s, updated_at = %s WHERE id = %s',
+            [job.processed, job.updated_at, job.id]
+        )
+    send_notification(project_id=job.project_id, type='import_job', data=ImportJobSerializer(job).data, after_commit=False)
+
+
+def run_import_job(job_id: int):
+    job = ImportJob.objects.select_related('project', 'created_by').get(id=job_id)
+    progress_connection = connections.create_connection(DEFAULT_DB_ALIAS)
+    try:
+        update_import_job(job, status=ImportJob.Status.RUNNING, processed=0, error='')
+        importer = KeyImporter(job.project, job.created_by)
+        with transaction.atomic():
+            for lang, path in job.files.items():
+                with job_storage.open(path) as file:
+                    importer.add(lang, iter_json_entries(file))
+                update_import_progress(job, progress_connection, job.processed + 1)
+            saved_keys = importer.save()
+        saved_keys = Key.objects.filter(id__in=saved_keys).select_related('created_by').prefetch_related(
+            'translations__created_by', 'translations__reviewed_by'
+        )
+        data = KeySerializer(saved_keys, many=True).data
+        send_notification(project_id=job.project_id, type='languages', data=LanguageSerializer(job.project.languages.all(), many=True).data)
+        send_notification(project_id=job.project_id, type='import', data=data)
+        update_import_job(job, status=ImportJob.Status.DONE, result={'keys': len(data)})
+    except Exception as e:
+        logger.exception('Import job %s failed.', job.id)
+        update_import_job(job, status=ImportJob.Status.FAILED, error=str(e))
+    finally:
+        progress_connection.close()
+        for path in job.files.values():
+            job_storage.delete(path)
+
+
+def resume_import_jobs() -> list:
+    jobs = ImportJob.objects.filter(status__in=[ImportJob.Status.PENDING, ImportJob.Status.RUNNING]).order_by('id')
+    job_ids = []
+    for job in jobs:
+        if all(job_storage.exists(path) for path in job.files.values()):
+            run_import_job(job.id)
+            job_ids.append(job.id)
+        else:
+            update_import_job(job, status=ImportJob.Status.FAILED, error='The uploaded files are no longer available.')
+    return job_ids
@@ -0,0 +1,45 @@
+from timeit import timeit
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from keys.exporter import iter_files
+from keys.models import Key
+from projects.models import Language, Project
+from translations.models import Translation
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Seeds a temporary project and times sequential and parallel export rendering.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keys', type=int, default=5000)
+        parser.add_argument('--languages', type=int, default=20)
+        parser.add_argument('--workers', type=int, default=4)
+
+    def handle(self, *args, **options):
+        user = User.objects.create(email='benchmark@i18nizely.local', first_name='Benchmark', last_name='User')
+        try:
+            project = Project.objects.create(name='Benchmark', created_by=user, main_language='aa')
+            codes = [f'{chr(97 + i // 26)}{chr(97 + i % 26)}' for i in range(options['languages'])]
+            Language.objects.bulk_create([Language(code=code, project=project) for code in codes])
+            keys = Key.objects.bulk_create([
+                Key(name=f'section{i % 100}.screen{i % 7}.label-{i}', project=project, created_by=user)
+                for i in range(options['keys'])
+            ])
+            for code in codes:
+                Translation.objects.bulk_create([
+                    Translation(text=f'{code} text for {key.name}', language=code, key=key, created_by=user)
+                    for key in keys
+                ], batch_size=2000)
+            for workers in [1, options['workers']]:
+                with override_settings(EXPORT_WORKERS=workers):
+                    self.render(project, codes)
+                    elapsed = timeit(lambda: self.render(project, codes), number=3) / 3
+                self.stdout.write(f'{workers} worker(s): {elapsed * 1000:.1f} ms')
+        finally:
+            user.delete()
+
+    def render(self, project: Project, codes: list):
+        for _, file in iter_files(project, codes, ['json', 'arb'], False):
+            file.close()
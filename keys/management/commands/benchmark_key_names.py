@@ -0,0 +1,24 @@
+from timeit import timeit
+from django.core.management.base import BaseCommand
+
+from keys.codec import arb_from_key, decode_segment, encode_segment, key_from_arb
+
+
+class Command(BaseCommand):
+    help = 'Times the key name codec on a synthetic project.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keys', type=int, default=100000)
+
+    def handle(self, *args, **options):
+        sections = [f'section{i}' for i in range(50)]
+        screens = [f'screen{i}Title' for i in range(200)]
+        arb_keys = [f'{sections[i % 50]}_{screens[i % 200]}_labelText{i}' for i in range(options['keys'])]
+        names = [key_from_arb(key) for key in arb_keys]
+        decode_segment.cache_clear()
+        encode_segment.cache_clear()
+        decode_time = timeit(lambda: [key_from_arb(key) for key in arb_keys], number=1)
+        encode_time = timeit(lambda: [arb_from_key(name) for name in names], number=1)
+        self.stdout.write(f'{len(arb_keys)} keys')
+        self.stdout.write(f'decode: {decode_time * 1000:.1f} ms ({decode_segment.cache_info().hits} cache hits)')
+        self.stdout.write(f'encode: {encode_time * 1000:.1f} ms ({encode_segment.cache_info().hits} cache hits)')
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from keys.jobs import resume_import_jobs
+
+
+class Command(BaseCommand):
+    help = 'Reruns import jobs left pending or running, e.g. after a restart. Jobs whose uploads are gone are marked as failed.'
+
+    def handle(self, *args, **options):
+        job_ids = resume_import_jobs()
+        self.stdout.write(f'{len(job_ids)} import jobs resumed')
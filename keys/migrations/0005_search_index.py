@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:10
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('keys', '0004_importjob'),
+        ('projects', '0009_record_project_created_at_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='key',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector(models.Func(models.F('name'), models.Value('.-_'), models.Value('   '), function='translate'), config='simple'), name='key_name_search_idx'),
+        ),
+    ]
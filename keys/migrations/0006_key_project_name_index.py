@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('keys', '0005_search_index'),
+        ('projects', '0009_record_project_created_at_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='key',
+            index=models.Index(fields=['project', 'name', 'id'], name='keys_key_project_863cc8_idx'),
+        ),
+    ]
@@ -1,5 +1,8 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 
+from translations.search import name_vector
+
 
 class Key(models.Model):
     name = models.CharField(max_length=255)
@@ -12,6 +15,29 @@ class Key(models.Model):
 
     class Meta:
         unique_together = ('name', 'project')
+        indexes = [
+            models.Index(fields=['project', 'name', 'id']),
+            GinIndex(name_vector(), name='key_name_search_idx')
+        ]
 
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+
+class ImportJob(models.Model):
+    class Status(models.IntegerChoices):
+        PENDING = 1
+        RUNNING = 2
+        DONE = 3
+        FAILED = 4
+
+    project = models.ForeignKey('projects.Project', on_delete=models.CASCADE, related_name='import_jobs')
+    status = models.IntegerField(choices=Status.choices, default=Status.PENDING)
+    files = models.JSONField(default=dict)
+    processed = models.IntegerField(default=0)
+    total = models.IntegerField(default=0)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey('users.User', on_delete=models.SET_NULL, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
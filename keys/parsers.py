@@ -0,0 +1,106 @@
+import codecs, re
+from json import JSONDecoder
+from json.decoder import scanstring
+
+from .codec import key_from_arb
+
+
+WHITESPACE = re.compile(r'\s*')
+DELIMITER = re.compile(r'[\s,\]}]')
+DECODER = JSONDecoder()
+
+
+class JsonEntryReader:
+    chunk_size = 64 * 1024
+
+    def __init__(self, file):
+        self.file = file
+        self.decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        data = self.file.read(self.chunk_size)
+        if not data:
+            self.eof = True
+        if isinstance(data, bytes):
+            data = self.decoder.decode(data, final=self.eof)
+        self.buffer = self.buffer[self.position:] + data
+        self.position = 0
+        return not self.eof
+
+    def peek(self) -> str:
+        while True:
+            self.position = WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.fill():
+                raise ValueError('Unexpected end of file.')
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f'Expecting \'{char}\' at position {self.position}.')
+        self.position += 1
+
+    def read_string(self) -> str:
+        if self.peek() != '"':
+            raise ValueError(f'Expecting string at position {self.position}.')
+        while True:
+            try:
+                value, self.position = scanstring(self.buffer, self.position + 1)
+                return value
+            except ValueError:
+                if not self.fill():
+                    raise
+
+    def skip_value(self):
+        self.peek()
+        while not DELIMITER.search(self.buffer, self.position) and self.fill():
+            pass
+        while True:
+            try:
+                _, self.position = DECODER.raw_decode(self.buffer, self.position)
+                return
+            except ValueError:
+                if not self.fill():
+                    raise
+
+    def entries(self):
+        self.expect('{')
+        stack = []
+        prefix, skip = '', False
+        first = True
+        while True:
+            if self.peek() == '}':
+                self.position += 1
+                if not stack:
+                    return
+                prefix, skip = stack.pop()
+                first = False
+                continue
+            if not first:
+                self.expect(',')
+            key = self.read_string()
+            self.expect(':')
+            key_skip = skip or key[0] == '@'
+            key_name = '' if key_skip else prefix + key_from_arb(key)
+            first = False
+            char = self.peek()
+            if char == '{':
+                self.position += 1
+                stack.append((prefix, skip))
+                prefix, skip = key_name + '.', key_skip
+                first = True
+            elif char == '"':
+                text = self.read_string()
+                if text and not key_skip:
+                    yield key_name, text
+            else:
+                self.skip_value()
+
+
+def iter_json_entries(file):
+    return JsonEntryReader(file).entries()
@@ -1,6 +1,6 @@
 from rest_framework.serializers import ModelSerializer, ValidationError, CharField
 
-from .models import Key
+from .models import ImportJob, Key
 from translations.serializers import TranslationDetailSerializer
 from users.serializers import UserDetailSerializer
 
@@ -41,3 +41,15 @@ class KeyCreateSerializer(ModelSerializer):
         if Key.objects.filter(name=value, project=project).exists():
             raise ValidationError('Key with this name already exists.')
         return value
+
+
+class KeyGridSerializer(ModelSerializer):
+    class Meta:
+        model = Key
+        fields = ['id', 'name', 'description', 'image', 'created_by', 'created_at', 'updated_at']
+
+
+class ImportJobSerializer(ModelSerializer):
+    class Meta:
+        model = ImportJob
+        exclude = ['files']
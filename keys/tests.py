@@ -1,3 +1,104 @@
-from django.test import TestCase
+import io, json, random, re
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from .codec import key_from_arb
+from .parsers import JsonEntryReader, iter_json_entries
+from .writers import writers
+
+
+def flatten(data: dict, prefix: str = '') -> list:
+    entries = []
+    for key, value in data.items():
+        if key[0] == '@':
+            continue
+        name = prefix + key_from_arb(key)
+        if isinstance(value, dict):
+            entries.extend(flatten(value, name + '.'))
+        elif isinstance(value, str) and value:
+            entries.append((name, value))
+    return entries
+
+
+class JsonEntryReaderTests(SimpleTestCase):
+    texts = ['', 'Hello', 'Hello, {name}!', 'quote " and \\ slash', 'line\nbreak\ttab', 'ünïcødé ✓', '😀 emoji', '} ] , :']
+    keys = ['title', 'homePage', 'home_page', 'submit-button', 'ñame', '@title', '@@locale', 'with space', 'a"b', 'x\\y']
+
+    def random_value(self, rand: random.Random, depth: int):
+        kind = rand.random()
+        if depth < 4 and kind < 0.25:
+            return self.random_object(rand, depth + 1)
+        if kind < 0.75:
+            return rand.choice(self.texts)
+        return rand.choice([0, -1.5, 1e10, True, False, None, [], [1, 'a', {'b': 'c'}], {}])
+
+    def random_object(self, rand: random.Random, depth: int = 0) -> dict:
+        return {
+            rand.choice(self.keys) + str(rand.randrange(3)): self.random_value(rand, depth)
+            for _ in range(rand.randrange(6))
+        }
+
+    def read(self, content, chunk_size: int) -> list:
+        reader = JsonEntryReader(io.BytesIO(content) if isinstance(content, bytes) else io.StringIO(content))
+        reader.chunk_size = chunk_size
+        return list(reader.entries())
+
+    def test_matches_recursive_flatten(self):
+        rand = random.Random(1234)
+        for _ in range(300):
+            data = self.random_object(rand)
+            content = json.dumps(data, ensure_ascii=rand.random() < 0.5, indent=rand.choice([None, 0, 2]))
+            expected = flatten(data)
+            for chunk_size in [1, 2, 3, 7, 64 * 1024]:
+                with self.subTest(content=content, chunk_size=chunk_size):
+                    self.assertEqual(self.read(content.encode(), chunk_size), expected)
+            self.assertEqual(self.read(content, 5), expected)
+
+    def test_utf8_bom(self):
+        content = '\ufeff{"hello": "Hëllo"}'.encode()
+        for chunk_size in [1, 2, 4]:
+            self.assertEqual(self.read(content, chunk_size), [('hello', 'Hëllo')])
+
+    def test_invalid_json(self):
+        for content in ['', '[]', '{"a": "b"', '{"a" "b"}', '{"a": "b" "c": "d"}', '{"a": tru}', '{"a": "b}']:
+            for chunk_size in [1, 3, 64 * 1024]:
+                with self.subTest(content=content, chunk_size=chunk_size), self.assertRaises(ValueError):
+                    self.read(content.encode(), chunk_size)
+
+
+class WriterTests(SimpleTestCase):
+    def render(self, type: str, entries: list, source_lang: str = None) -> str:
+        file = io.BytesIO()
+        writer = writers[type](file, 'es', source_lang)
+        writer.start()
+        for entry in sorted(entries, key=lambda entry: entry[0].encode('utf-8')):
+            writer.add(*entry)
+        writer.end()
+        return file.getvalue().decode('utf-8')
+
+    def test_json_prefix_conflicts(self):
+        entries = [('a', '1'), ('a-x', '2'), ('a.b', '3'), ('a.b.c', '4'), ('a.d.e', '5'), ('b.c', '6'), ('b.c.d', '7'), ('b.e', '8')]
+        content = self.render('json', entries)
+        self.assertEqual(json.loads(content), {
+            'a': '1', 'a-x': '2', 'a.b': '3', 'a.b.c': '4', 'a.d.e': '5',
+            'b': {'c': '6', 'c.d': '7', 'e': '8'},
+        })
+        self.assertEqual(sorted(iter_json_entries(io.StringIO(content))), sorted(entries))
+
+    def test_json_nesting(self):
+        entries = [('a.b', '1'), ('a.c.d', '2'), ('a.c.e', '3'), ('b', '4')]
+        content = self.render('json', entries)
+        self.assertEqual(json.loads(content), {'a': {'b': '1', 'c': {'d': '2', 'e': '3'}}, 'b': '4'})
+
+    def test_android_names(self):
+        content = self.render('xml', [('a.b-c', '1'), ('a.b.c', '2'), ('a_b_c', '3'), ('1st', '4')])
+        names = re.findall(r'name="([^"]*)"', content)
+        self.assertEqual(len(set(names)), 4)
+        self.assertIn('a_b_c', names)
+        for name in names:
+            self.assertRegex(name, r'^[a-zA-Z_][a-zA-Z0-9_]*$')
+
+    def test_xliff_source_and_target(self):
+        content = self.render('xliff', [('hello', 'Hola', 'Hello & bye')], 'en')
+        self.assertIn('source-language="en" target-language="es"', content)
+        self.assertIn('<source>Hello &amp; bye</source>\n        <target>Hola</target>', content)
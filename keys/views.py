@@ -1,6 +1,4 @@
-from datetime import datetime
-import json, io
-from zipfile import ZipFile
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.mixins import ListModelMixin, CreateModelMixin, UpdateModelMixin, DestroyModelMixin
@@ -9,27 +7,38 @@ from django.db.models import Q
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.http import HttpResponse
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
 
-from projects.permissions import IsAdminOrDeveloper
-from projects.models import Project, Record, Language
+from projects.audit import AuditLog
+from projects.counters import subtract_language_counts
+from projects.permissions import IsAdminOrDeveloper, IsAnyRole
+from projects.models import Contribution, Language, Project, Record
+from projects.notifications import send_notification
 from projects.serializers import LanguageSerializer
-from translations.models import Translation, Version
-from .models import Key
-from .serializers import KeyCreateSerializer, KeySerializer
+from translations.models import Translation
 from users.models import User
+from users.serializers import UserDetailSerializer
+from .exporter import export_etag, iter_files, zip_response
+from .importer import KeyImporter
+from .jobs import create_import_job
+from .models import ImportJob, Key
+from .pagination import KeyPagination
+from .parsers import iter_json_entries
+from .serializers import ImportJobSerializer, KeyCreateSerializer, KeyGridSerializer, KeySerializer
 
 
 class KeyViewSet(GenericViewSet, ListModelMixin, CreateModelMixin, UpdateModelMixin, DestroyModelMixin):
     permission_classes = [IsAuthenticated, IsAdminOrDeveloper]
+    pagination_class = KeyPagination
 
     def get_queryset(self):
         name = self.request.query_params.get('name')
         if name:
-            return Key.objects.filter(Q(project=self.kwargs['project_pk']) & Q(name__icontains=name))
-        return Key.objects.filter(project=self.kwargs['project_pk'])
+            queryset = Key.objects.filter(Q(project=self.kwargs['project_pk']) & Q(name__icontains=name))
+        else:
+            queryset = Key.objects.filter(project=self.kwargs['project_pk'])
+        if self.action == 'list':
+            queryset = queryset.select_related('created_by').prefetch_related('translations__created_by', 'translations__reviewed_by')
+        return queryset
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -37,25 +46,11 @@ class KeyViewSet(GenericViewSet, ListModelMixin, CreateModelMixin, UpdateModelMi
         return KeySerializer
 
     def send_notification(self, project_id: int, type: str, data):
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            f'project_{project_id}',
-            {
-                'type': 'send_notification',
-                'data': {
-                    'type': f'key.{type}',
-                    'data': data
-                }
-            }
-        )
+        send_notification(project_id, f'key.{type}', data)
 
     def perform_create(self, serializer):
         project = get_object_or_404(Project, id=self.kwargs['project_pk'])
-        Record.objects.create(
-            type=1,
-            user=self.request.user,
-            project=project
-        )
+        AuditLog.of(self.request).add(Record.Type.CREATE_KEY, self.request.user, project)
         translation = serializer.validated_data.pop('translation')
         serializer.save(project=project, created_by=self.request.user)
         Translation.objects.create(
@@ -65,147 +60,86 @@ class KeyViewSet(GenericViewSet, ListModelMixin, CreateModelMixin, UpdateModelMi
             text=translation
         )
         language = project.languages.get(code=project.main_language)
-        language.translation_count += 1
-        language.save()
+        language.update_counts(translation_count=1)
+        Contribution.add(self.request.user, project, translation_count=1)
+        project.advance_revision()
         self.send_notification(project_id=project.id, type='language', data=LanguageSerializer(language).data)
         self.send_notification(project_id=project.id, type='create', data=serializer.data)
 
     def perform_update(self, serializer):
         instance = self.get_object()
-        Record.objects.create(
-            type=3,
-            user=self.request.user,
-            project=instance.project
-        )
+        AuditLog.of(self.request).add(Record.Type.EDIT_KEY, self.request.user, instance.project)
         serializer.save()
+        instance.project.advance_revision()
         self.send_notification(project_id=instance.project.id, type='update', data=serializer.data)
 
     def perform_destroy(self, instance):
-        project = instance.project
-        Record.objects.create(
-            type=2,
-            user=self.request.user,
-            project=project
-        )
-        translations = instance.translations.all()
-        languages = []
-        for trans in translations:
-            lang = project.languages.get(code=trans.language)
-            lang.translation_count -= 1
-            lang.save()
-            languages.append(lang)
+        self.destroy_keys(instance.project, Key.objects.filter(id=instance.id))
+        self.send_notification(project_id=instance.project.id, type='destroy', data=instance.id)
+
+    def destroy_keys(self, project: Project, keys) -> list:
+        with transaction.atomic():
+            key_ids = list(keys.select_for_update().values_list('id', flat=True))
+            if not key_ids:
+                return []
+            AuditLog.of(self.request).add(Record.Type.DELETE_KEY, self.request.user, project, count=len(key_ids))
+            languages = subtract_language_counts(project, Translation.objects.filter(key__in=key_ids))
+            Key.objects.filter(id__in=key_ids).delete()
+            project.advance_revision()
         self.send_notification(project_id=project.id, type='languages', data=LanguageSerializer(languages, many=True).data)
-        self.send_notification(project_id=project.id, type='destroy', data=instance.id)
-        instance.delete()
-    
+        return key_ids
+
+    @action(detail=False, methods=['POST'], url_path='delete')
+    def destroy_many(self, request, *args, **kwargs):
+        ids = request.data.get('ids')
+        if not isinstance(ids, list) or not all(isinstance(id, int) for id in ids):
+            return Response({'ids': ['A list of key ids is required.']}, status=status.HTTP_400_BAD_REQUEST)
+        project = get_object_or_404(Project, id=self.kwargs['project_pk'])
+        key_ids = self.destroy_keys(project, project.keys.filter(id__in=ids))
+        if key_ids:
+            self.send_notification(project_id=project.id, type='destroy_many', data=key_ids)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
     @action(detail=False, methods=['POST'], url_path='import')
     def import_keys(self, request, *args, **kwargs):
         files = request.FILES
         if not files:
             return Response({'detail': 'No files sent.'}, status=status.HTTP_400_BAD_REQUEST)
+        dry_run = request.query_params.get('dry_run') in ['True', 'true', '1']
         project = get_object_or_404(Project, id=kwargs['project_pk'])
-        languages = project.get_language_codes()
-        saved_keys = []
-        for lang in files:
-            if lang not in languages:
-                continue
+        importer = KeyImporter(project, request.user, dry_run, AuditLog.of(request))
+        with transaction.atomic():
             try:
-                content = json.load(files[lang])
-                saved_keys = self.save_keys(request.user, project, lang, content)
+                for lang in files:
+                    if lang in importer.languages:
+                        importer.add(lang, iter_json_entries(files[lang]))
+                if dry_run:
+                    return Response(importer.diff())
+                saved_keys = importer.save()
             except Exception as e:
+                transaction.set_rollback(True)
                 return Response({'detail': 'File type not allowed.', 'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        saved_keys = project.keys.filter(id__in=saved_keys).select_related('created_by').prefetch_related(
+            'translations__created_by', 'translations__reviewed_by'
+        )
         serializer = self.get_serializer(saved_keys, many=True)
         self.send_notification(project_id=project.id, type='languages', data=LanguageSerializer(project.languages.all(), many=True).data)
         self.send_notification(project_id=project.id, type='import', data=serializer.data)
         return Response(serializer.data)
 
-    def save_keys(self, user: User, project: Project, lang: str, body: dict, key_name: str = ''):
-        saved_keys = []
-        for key in body:
-            if key[0] == '@':
-                continue
-            formated_key = self.format_key(key)
-            key_name += formated_key
-            if isinstance(body[key], str):
-                if not body[key]:
-                    continue
-                try:
-                    language = project.languages.get(code=lang)
-                    actual_key = project.keys.get(name=key_name)
-                    actual_trans = actual_key.translations.get(language=lang)
-                    if actual_trans.text != body[key]:
-                        self.update_translation(actual_trans, user, project, language, body[key])
-                        saved_keys.append(actual_key)
-                except Key.DoesNotExist:
-                    new_key = self.create_key(key_name, user, project, language, lang, body[key])
-                    saved_keys.append(new_key)
-                except Translation.DoesNotExist:
-                    self.create_translation(actual_key, user, language, lang, body[key])
-                    saved_keys.append(actual_key)
-            elif isinstance(body[key], dict):
-                key_name += '.'
-                nested_keys = self.save_keys(user, project, lang, body[key], key_name)
-                saved_keys.extend(nested_keys)
-                key_name = key_name[:-1]
-            key_name = key_name.replace(formated_key, '')
-        return set(saved_keys)
-
-    def format_key(self, key: str) -> str :
-        formated_key = ''
-        for c in key:
-            if c == '_':
-                formated_key += '.'
-                continue
-            if c.isupper():
-                formated_key += '-'
-            formated_key += c.lower()
-        return formated_key
+    @action(detail=False, methods=['POST'], url_path='import/jobs')
+    def import_job(self, request, *args, **kwargs):
+        files = request.FILES
+        if not files:
+            return Response({'detail': 'No files sent.'}, status=status.HTTP_400_BAD_REQUEST)
+        project = get_object_or_404(Project, id=kwargs['project_pk'])
+        job = create_import_job(project, request.user, files)
+        return Response(ImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
 
-    def update_translation(self, translation: Translation, user: User, project: Project, language: Language, text: str):
-        Version.objects.create(
-            text=translation.text,
-            translation=translation,
-            created_by=translation.created_by,
-            created_at=translation.updated_at
-        )
-        Record.objects.create(
-            type=5,
-            user=user,
-            project=project
-        )
-        if translation.is_reviewed:
-            language.reviewed_count -= 1
-            language.save()
-            translation.is_reviewed = False
-            translation.reviewed_at = None
-            translation.reviewed_by = None
-        translation.text = text
-        translation.updated_at = datetime.now()
-        translation.save()
-    
-    def create_key(self, key_name: str, user: User, project: Project, language: Language, lang: str, text: str):
-        Record.objects.create(
-            type=1,
-            user=user,
-            project=project
-        )
-        key = Key.objects.create(
-            name=key_name,
-            project=project,
-            created_by=user
-        )
-        self.create_translation(key, user, language, lang, text)
-        return key
-    
-    def create_translation(self, key: Key, user: User, language: Language, lang: str, text: str):
-        Translation.objects.create(
-            text=text,
-            language=lang,
-            key=key,
-            created_by=user
-        )
-        language.translation_count += 1
-        language.save()
+    @action(detail=False, methods=['GET'], url_path=r'import/jobs/(?P<job_pk>\d+)')
+    def import_job_status(self, request, *args, **kwargs):
+        job = get_object_or_404(ImportJob, id=kwargs['job_pk'], project=kwargs['project_pk'])
+        return Response(ImportJobSerializer(job).data)
 
     @action(detail=False, methods=['GET'], url_path='export')
     def export_keys(self, request, *args, **kwargs):
@@ -213,67 +147,51 @@ class KeyViewSet(GenericViewSet, ListModelMixin, CreateModelMixin, UpdateModelMi
         languages = request.query_params.getlist('languages')
         only_reviewed = request.query_params.get('only_reviewed') in ['True', 'true', '1']
         project = get_object_or_404(Project, id=kwargs['project_pk'])
-        if not languages:
-            languages = project.get_language_codes()
+        project_languages = project.get_language_codes()
+        languages = [lang for lang in languages if lang in project_languages] if languages else project_languages
         if not file_types:
             file_types = ['json', 'arb']
-        buffer = io.BytesIO()
-        writer = ZipFile(buffer, 'w')
-        for type in file_types:
-            for lang in languages:
-                file = self.format_file(type, project, lang, only_reviewed)
-                if file:
-                    writer.writestr(f'{lang}.{type}', file)
-        buffer_size = buffer.tell()
-        writer.close()
-        if buffer_size == 0:
-            response = Response(status=status.HTTP_204_NO_CONTENT)
-        else:
-            buffer.seek(0)
-            response = HttpResponse(buffer.getvalue(), content_type='application/zip')
-            filename = project.name.replace(' ', '-')
-            response['Content-Disposition'] = f'attachment; filename="{filename}.zip"'
-        buffer.close()
+        etag = export_etag(project, languages, file_types, only_reviewed)
+        files = iter_files(project, languages, file_types, only_reviewed)
+        response = zip_response(request, files, project.name.replace(' ', '-'), etag)
+        if not response:
+            return Response(status=status.HTTP_204_NO_CONTENT)
         return response
-    
-    def format_file(self, file_type: str, project: Project, lang: str, only_reviewed: bool):
-        formated_file = {}
-        keys = project.keys.all()
-        for key in keys:
-            name_list = key.name.split('.')
-            translation = key.translations.filter(language=lang).first()
-            if not translation or (only_reviewed and not translation.is_reviewed):
-                continue
-            text = translation.text
-            if not text:
-                continue
-            if file_type == 'json':
-                self.format_json(formated_file, name_list, text)
-            elif file_type == 'arb':
-                self.format_arb(formated_file, name_list, text)
-        if not formated_file:
-            return
-        return json.dumps(formated_file, indent=2).encode('utf-8')
 
-    def format_json(self, file: dict, name_list: list, translation: str):
-        if len(name_list) == 1:
-            file[name_list[0]] = translation
-        else:
-            name_dict = file
-            for name in name_list[:-1]:
-                if name not in name_dict or not isinstance(name_dict[name], dict):
-                    name_dict[name] = {}
-                name_dict = name_dict[name]
-            name_dict[name_list[-1]] = translation
 
-    def format_arb(self, file: dict, name_list: list, translation: str):
-            key_name = ''
-            for name in name_list:
-                word_list = name.split('-')
-                key_name += word_list.pop(0)
-                for word in word_list:
-                    key_name += word[0].upper()
-                    key_name += word[1:]
-                key_name += '_'
-            key_name = key_name[:-1]
-            file[key_name] = translation
\ No newline at end of file
+class KeyGridViewSet(GenericViewSet, ListModelMixin):
+    serializer_class = KeyGridSerializer
+    permission_classes = [IsAuthenticated, IsAnyRole]
+    pagination_class = KeyPagination
+    cell_fields = ['id', 'text', 'is_reviewed', 'created_by', 'reviewed_by', 'updated_at']
+
+    def get_queryset(self):
+        name = self.request.query_params.get('name')
+        if name:
+            return Key.objects.filter(Q(project=self.kwargs['project_pk']) & Q(name__icontains=name))
+        return Key.objects.filter(project=self.kwargs['project_pk'])
+
+    def list(self, request, *args, **kwargs):
+        languages = request.query_params.getlist('language')
+        project_languages = list(Language.objects.filter(project=self.kwargs['project_pk']).order_by('code').values_list('code', flat=True))
+        languages = [lang for lang in languages if lang in project_languages] if languages else project_languages
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        keys = page if page is not None else list(queryset)
+        rows = {key.id: {**row, 'cells': {}} for key, row in zip(keys, self.get_serializer(keys, many=True).data)}
+        user_ids = {key.created_by_id for key in keys}
+        translations = Translation.objects.filter(key__in=rows, language__in=languages).values_list('key', 'language', *self.cell_fields)
+        for key_id, language, *cell in translations:
+            rows[key_id]['cells'][language] = cell
+            user_ids.update(cell[3:5])
+        user_ids.discard(None)
+        users = UserDetailSerializer(User.objects.filter(id__in=user_ids).only(*UserDetailSerializer.Meta.fields), many=True, context=self.get_serializer_context()).data
+        data = {
+            'languages': languages,
+            'cell_fields': self.cell_fields,
+            'keys': list(rows.values()),
+            'users': {user['id']: user for user in users}
+        }
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
@@ -0,0 +1,167 @@
+import hashlib, json, re
+from xml.sax.saxutils import escape, quoteattr
+
+from .codec import arb_from_key
+
+
+def quote(value: str) -> str:
+    value = value.replace('\\', '\\\\').replace('"', '\\"')
+    return '"' + value.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t') + '"'
+
+
+class FileWriter:
+    needs_source = False
+
+    def __init__(self, file, lang: str, source_lang: str = None):
+        self.file = file
+        self.lang = lang
+        self.source_lang = source_lang or lang
+
+    def write(self, data: str):
+        self.file.write(data.encode('utf-8'))
+
+    def start(self):
+        pass
+
+    def add(self, name: str, text: str, source: str = None):
+        raise NotImplementedError
+
+    def end(self):
+        pass
+
+
+class JsonWriter(FileWriter):
+    # Rows arrive sorted by name, so a leaf written in an object can only clash with a nested object
+    # opened later under the same segment. Those nested keys are written flat, e.g. {"a": "", "a.b": ""},
+    # which keeps the file valid and imports back to the same names.
+    def start(self):
+        self.path = []
+        self.leaves = [[]]
+        self.first = True
+        self.write('{')
+
+    def entry(self, name: str):
+        self.write(('\n' if self.first else ',\n') + '  ' * (len(self.path) + 1) + json.dumps(name) + ': ')
+        self.first = False
+
+    def is_leaf(self, segment: str) -> bool:
+        leaves = self.leaves[-1]
+        while leaves and not segment.startswith(leaves[-1]):
+            leaves.pop()
+        return bool(leaves) and leaves[-1] == segment
+
+    def close(self, depth: int):
+        while len(self.path) > depth:
+            self.path.pop()
+            self.leaves.pop()
+            self.write('\n' + '  ' * (len(self.path) + 1) + '}')
+
+    def add(self, name: str, text: str, source: str = None):
+        name_list = name.split('.')
+        depth = 0
+        while depth < min(len(self.path), len(name_list) - 1) and self.path[depth] == name_list[depth]:
+            depth += 1
+        self.close(depth)
+        leaf = name_list[-1]
+        for index in range(depth, len(name_list) - 1):
+            segment = name_list[index]
+            if self.is_leaf(segment):
+                leaf = '.'.join(name_list[index:])
+                break
+            self.entry(segment)
+            self.write('{')
+            self.path.append(segment)
+            self.leaves.append([])
+            self.first = True
+        else:
+            self.is_leaf(leaf)
+        self.entry(leaf)
+        self.write(json.dumps(text))
+        self.leaves[-1].append(leaf)
+
+    def end(self):
+        self.close(0)
+        self.write('\n}')
+
+
+class ArbWriter(JsonWriter):
+    def add(self, name: str, text: str, source: str = None):
+        self.entry(arb_from_key(name))
+        self.write(json.dumps(text))
+
+
+class PoWriter(FileWriter):
+    def start(self):
+        self.write('msgid ""\nmsgstr ""\n')
+        self.write(f'"Language: {self.lang}\\n"\n"Content-Type: text/plain; charset=UTF-8\\n"\n')
+
+    def add(self, name: str, text: str, source: str = None):
+        self.write(f'\nmsgid {quote(name)}\nmsgstr {quote(text)}\n')
+
+
+class XliffWriter(FileWriter):
+    needs_source = True
+
+    def start(self):
+        self.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        self.write('<xliff version="1.2" xmlns="urn:oasis:names:tc:xliff:document:1.2">\n')
+        self.write(
+            f'  <file original="messages" datatype="plaintext" source-language={quoteattr(self.source_lang)} '
+            f'target-language={quoteattr(self.lang)}>\n    <body>\n'
+        )
+
+    def add(self, name: str, text: str, source: str = None):
+        self.write(
+            f'      <trans-unit id={quoteattr(name)}>\n        <source>{escape(source or "")}</source>\n'
+            f'        <target>{escape(text)}</target>\n      </trans-unit>\n'
+        )
+
+    def end(self):
+        self.write('    </body>\n  </file>\n</xliff>\n')
+
+
+class AndroidWriter(FileWriter):
+    valid_name = re.compile(r'[a-zA-Z_][a-zA-Z0-9_]*')
+    invalid_chars = re.compile(r'[^a-zA-Z0-9_]')
+
+    def quote(self, value: str) -> str:
+        value = escape(value.replace('\\', '\\\\'))
+        value = value.replace('"', '\\"').replace('\'', '\\\'').replace('\n', '\\n').replace('\t', '\\t')
+        if value[:1] in ['@', '?']:
+            value = '\\' + value
+        return value
+
+    def resource_name(self, name: str) -> str:
+        # Replacing invalid characters alone maps e.g. a.b-c and a.b.c to the same resource, so rewritten
+        # names get a suffix derived from the original name, which stays the same across exports.
+        if self.valid_name.fullmatch(name):
+            return name
+        suffix = hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]
+        name = self.invalid_chars.sub('_', name)
+        if name[:1].isdigit():
+            name = '_' + name
+        return f'{name}_{suffix}'
+
+    def start(self):
+        self.write('<?xml version="1.0" encoding="utf-8"?>\n<resources>\n')
+
+    def add(self, name: str, text: str, source: str = None):
+        self.write(f'    <string name="{self.resource_name(name)}">{self.quote(text)}</string>\n')
+
+    def end(self):
+        self.write('</resources>\n')
+
+
+class StringsWriter(FileWriter):
+    def add(self, name: str, text: str, source: str = None):
+        self.write(f'{quote(name)} = {quote(text)};\n')
+
+
+writers = {
+    'json': JsonWriter,
+    'arb': ArbWriter,
+    'po': PoWriter,
+    'xliff': XliffWriter,
+    'xml': AndroidWriter,
+    'strings': StringsWriter,
+}
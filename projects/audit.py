@@ -0,0 +1,30 @@
+from django.db import transaction
+
+from .models import Project, Record
+
+
+class AuditLog:
+    def __init__(self):
+        self.records = []
+
+    @staticmethod
+    def of(request) -> 'AuditLog':
+        if not hasattr(request, 'audit_log'):
+            request.audit_log = AuditLog()
+        return request.audit_log
+
+    def add(self, type: int, user, project: Project, count: int = 1, merge: bool = False):
+        if count <= 0:
+            return
+        if merge:
+            for record in self.records:
+                if record.type == type and record.user == user and record.project_id == project.id:
+                    record.count += count
+                    return
+        self.records.append(Record(type=type, user=user, project=project, count=count))
+        transaction.on_commit(self.save)
+
+    def save(self):
+        records, self.records = self.records, []
+        if records:
+            Record.objects.bulk_create(records)
@@ -1,34 +1,48 @@
-import json
+import asyncio
+from urllib.parse import parse_qs
+from django.conf import settings
 from channels.generic.websocket import AsyncWebsocketConsumer
-from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
 
-from projects.models import Project
+from projects.notifications import get_group_names, set_event_loop
+from projects.roles import get_user_roles
 
 class ProjectConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         self.project_id = self.scope['url_route']['kwargs']['project_id']
-        self.room_group_name = f'project_{self.project_id}'
         self.user = self.scope['user']
-        project = await sync_to_async(lambda: Project.objects.filter(id=self.project_id).first())()
-        if not self.user.is_authenticated or not project:
-            await self.close()
-            return
-        is_collaborators = await sync_to_async(lambda: project.collaborators.filter(user=self.user).exists())()
-        created_by = await sync_to_async(lambda: project.created_by)()
-        if created_by != self.user and not is_collaborators:
+        encoding = parse_qs(self.scope['query_string'].decode()).get('encoding', ['json'])[0]
+        groups = get_group_names(self.project_id)
+        self.room_group_name = groups.get(encoding, groups['json'])
+        self.recheck_task = None
+        if not self.user.is_authenticated or not await database_sync_to_async(get_user_roles)(self.user.id, self.project_id):
             await self.close()
             return
+        set_event_loop(asyncio.get_running_loop())
         await self.channel_layer.group_add(
             self.room_group_name,
             self.channel_name
         )
         await self.accept()
+        self.recheck_task = asyncio.create_task(self.recheck_roles())
+
+    async def recheck_roles(self):
+        while True:
+            await asyncio.sleep(settings.WS_ROLE_RECHECK_INTERVAL)
+            if not await database_sync_to_async(get_user_roles)(self.user.id, self.project_id):
+                await self.close()
+                return
 
     async def disconnect(self, close_code):
+        if self.recheck_task:
+            self.recheck_task.cancel()
         await self.channel_layer.group_discard(
             self.room_group_name,
             self.channel_name
         )
 
     async def send_notification(self, event):
-        await self.send(text_data=json.dumps(event['data']))
\ No newline at end of file
+        if 'bytes' in event:
+            await self.send(bytes_data=event['bytes'])
+        else:
+            await self.send(text_data=event['text'])
\ No newline at end of file
@@ -0,0 +1,49 @@
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, Value, When
+
+from translations.models import Translation
+from .models import Language, Project
+
+
+def reconcile_language_counts(project: Project) -> list:
+    with transaction.atomic():
+        languages = list(Language.objects.select_for_update().filter(project=project))
+        counts = {
+            row['language']: row
+            for row in Translation.objects.filter(key__project=project).values('language').annotate(
+                translation_count=Count('id'),
+                reviewed_count=Count('id', filter=Q(is_reviewed=True))
+            )
+        }
+        drifted = []
+        for language in languages:
+            row = counts.get(language.code, {})
+            translation_count = row.get('translation_count', 0)
+            reviewed_count = row.get('reviewed_count', 0)
+            if language.translation_count != translation_count or language.reviewed_count != reviewed_count:
+                language.translation_count = translation_count
+                language.reviewed_count = reviewed_count
+                drifted.append(language)
+        Language.objects.bulk_update(drifted, ['translation_count', 'reviewed_count'])
+    return drifted
+
+
+def subtract_language_counts(project: Project, translations) -> list:
+    counts = list(translations.order_by().values('language').annotate(
+        translation_count=Count('id'),
+        reviewed_count=Count('id', filter=Q(is_reviewed=True))
+    ))
+    if not counts:
+        return []
+    languages = Language.objects.filter(project=project, code__in=[row['language'] for row in counts])
+    languages.update(
+        translation_count=F('translation_count') - Case(
+            *[When(code=row['language'], then=Value(row['translation_count'])) for row in counts],
+            default=Value(0)
+        ),
+        reviewed_count=F('reviewed_count') - Case(
+            *[When(code=row['language'], then=Value(row['reviewed_count'])) for row in counts],
+            default=Value(0)
+        )
+    )
+    return list(languages)
@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.db import transaction
+
+from translations.models import Translation
+from utils.worker_util import WorkerUtil
+from . import notifications
+from .models import LanguageRemovalJob
+from .serializers import LanguageRemovalJobSerializer
+
+
+def send_notification(project_id: int, type: str, data):
+    notifications.send_notification(project_id, f'project.{type}', data)
+
+
+def get_language_translations(project_id: int, codes: list):
+    return Translation.objects.filter(key__project=project_id, language__in=codes)
+
+
+def remove_languages(project_id: int, codes: list, total: int) -> bool:
+    if total <= settings.LANGUAGE_REMOVAL_BACKGROUND_THRESHOLD:
+        get_language_translations(project_id, codes).delete()
+        return False
+    last_id = get_language_translations(project_id, codes).order_by('-id').values_list('id', flat=True).first()
+    if last_id is None:
+        return False
+    job = LanguageRemovalJob.objects.create(project_id=project_id, languages=codes, last_id=last_id, total=total)
+    transaction.on_commit(lambda: WorkerUtil.submit(run_language_removal, job.id))
+    return True
+
+
+def update_language_removal(job: LanguageRemovalJob, **fields):
+    for attr, value in fields.items():
+        setattr(job, attr, value)
+    job.save()
+    send_notification(project_id=job.project_id, type='language_removal', data=LanguageRemovalJobSerializer(job).data)
+
+
+def run_language_removal(job_id: int):
+    job = LanguageRemovalJob.objects.select_related('project').get(id=job_id)
+    update_language_removal(job, status=LanguageRemovalJob.Status.RUNNING)
+    translations = get_language_translations(job.project_id, job.languages).filter(id__lte=job.last_id)
+    try:
+        while True:
+            ids = list(translations.order_by('id').values_list('id', flat=True)[:settings.LANGUAGE_REMOVAL_CHUNK_SIZE])
+            if not ids:
+                break
+            Translation.objects.filter(id__in=ids).delete()
+            deleted = job.deleted + len(ids)
+            update_language_removal(job, deleted=deleted, total=max(job.total, deleted))
+    except Exception as e:
+        update_language_removal(job, status=LanguageRemovalJob.Status.FAILED, error=str(e))
+        return
+    job.project.advance_revision()
+    update_language_removal(job, status=LanguageRemovalJob.Status.DONE)
+
+
+def resume_language_removals() -> list:
+    jobs = LanguageRemovalJob.objects.filter(
+        status__in=[LanguageRemovalJob.Status.PENDING, LanguageRemovalJob.Status.RUNNING, LanguageRemovalJob.Status.FAILED]
+    ).order_by('id')
+    job_ids = list(jobs.values_list('id', flat=True))
+    for job_id in job_ids:
+        run_language_removal(job_id)
+    return job_ids
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from projects.counters import reconcile_language_counts
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = 'Recomputes Language translation and review counters from the stored translations.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('project_ids', nargs='*', type=int)
+
+    def handle(self, *args, **options):
+        projects = Project.objects.all()
+        if options['project_ids']:
+            projects = projects.filter(id__in=options['project_ids'])
+        for project in projects.iterator():
+            for language in reconcile_language_counts(project):
+                self.stdout.write(
+                    f'Project {project.id} \'{language.code}\': '
+                    f'translation_count={language.translation_count}, reviewed_count={language.reviewed_count}'
+                )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from projects.jobs import resume_language_removals
+
+
+class Command(BaseCommand):
+    help = 'Finishes language removal jobs left pending, running or failed, e.g. after a restart.'
+
+    def handle(self, *args, **options):
+        job_ids = resume_language_removals()
+        self.stdout.write(f'{len(job_ids)} language removal jobs resumed')
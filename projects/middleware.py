@@ -2,27 +2,17 @@ from urllib.parse import parse_qs
 from channels.middleware import BaseMiddleware
 from django.contrib.auth.models import AnonymousUser
 from django.db import close_old_connections
-from rest_framework_simplejwt.tokens import UntypedToken
-from django.contrib.auth import get_user_model
-import jwt
-from django.conf import settings
 from asgiref.sync import sync_to_async
 
-User = get_user_model()
+from users.authentication import get_token_user
 
 class JWTAuthMiddleware(BaseMiddleware):
     async def __call__(self, scope, receive, send):
         query_string = parse_qs(scope['query_string'].decode())
         token = query_string.get('token', [None])[0]
-        try:
-            if token:
-                UntypedToken(token)
-                payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-                user_id = payload.get("user_id")
-                scope["user"] = await sync_to_async(User.objects.get)(id=user_id)
-            else:
-                scope["user"] = AnonymousUser()
-        except Exception:
-            scope["user"] = AnonymousUser()
+        user = None
+        if token:
+            user = await sync_to_async(get_token_user)(token)
+        scope["user"] = user or AnonymousUser()
         close_old_connections()
         return await super().__call__(scope, receive, send)
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill_contributions(apps, schema_editor):
+    Contribution = apps.get_model('projects', 'Contribution')
+    Translation = apps.get_model('translations', 'Translation')
+    contributions = {}
+    created = Translation.objects.filter(created_by__isnull=False).values(
+        'key__project', 'created_by', date=TruncDate('created_at')
+    ).annotate(count=Count('id'))
+    for row in created:
+        contribution = contributions.setdefault((row['created_by'], row['key__project'], row['date']), [0, 0])
+        contribution[0] += row['count']
+    reviewed = Translation.objects.filter(is_reviewed=True, reviewed_by__isnull=False, reviewed_at__isnull=False).values(
+        'key__project', 'reviewed_by', date=TruncDate('reviewed_at')
+    ).annotate(count=Count('id'))
+    for row in reviewed:
+        contribution = contributions.setdefault((row['reviewed_by'], row['key__project'], row['date']), [0, 0])
+        contribution[1] += row['count']
+    Contribution.objects.bulk_create([
+        Contribution(user_id=user, project_id=project, date=date, translation_count=counts[0], reviewed_count=counts[1])
+        for (user, project, date), counts in contributions.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_project_revision'),
+        ('translations', '0003_alter_translation_text'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Contribution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('translation_count', models.IntegerField(default=0)),
+                ('reviewed_count', models.IntegerField(default=0)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='contributions', to='projects.project')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='contributions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'project', 'date')},
+            },
+        ),
+        migrations.RunPython(backfill_contributions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_contribution'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='record',
+            name='count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction, IntegrityError
+from django.db.models import F
+from django.utils import timezone
 from django.contrib.postgres.fields import ArrayField
 
 
@@ -7,6 +9,7 @@ class Project(models.Model):
     description = models.TextField(blank=True)
     created_by = models.ForeignKey('users.User', on_delete=models.CASCADE, related_name='created_projects')
     main_language = models.CharField(max_length=2)
+    revision = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -19,6 +22,9 @@ class Project(models.Model):
             language_codes.append(lang.code)
         return language_codes
 
+    def advance_revision(self):
+        Project.objects.filter(id=self.id).update(revision=F('revision') + 1)
+
 
 class Language(models.Model):
     code = models.CharField(max_length=2)
@@ -32,6 +38,36 @@ class Language(models.Model):
     def __str__(self):
         return self.code
 
+    def update_counts(self, translation_count: int = 0, reviewed_count: int = 0):
+        Language.objects.filter(id=self.id).update(
+            translation_count=F('translation_count') + translation_count,
+            reviewed_count=F('reviewed_count') + reviewed_count
+        )
+        self.refresh_from_db(fields=['translation_count', 'reviewed_count'])
+
+
+class LanguageRemovalJob(models.Model):
+    class Status(models.IntegerChoices):
+        PENDING = 1
+        RUNNING = 2
+        DONE = 3
+        FAILED = 4
+
+    project = models.ForeignKey('projects.Project', on_delete=models.CASCADE, related_name='language_removal_jobs')
+    status = models.IntegerField(choices=Status.choices, default=Status.PENDING)
+    languages = ArrayField(models.CharField(max_length=2))
+    last_id = models.BigIntegerField()
+    deleted = models.IntegerField(default=0)
+    total = models.IntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @staticmethod
+    def pending_languages(project_id: int) -> set:
+        jobs = LanguageRemovalJob.objects.filter(project=project_id).exclude(status=LanguageRemovalJob.Status.DONE)
+        return {code for codes in jobs.values_list('languages', flat=True) for code in codes}
+
 
 class Collaborator(models.Model):
     class Role(models.IntegerChoices):
@@ -60,4 +96,38 @@ class Record(models.Model):
     type = models.IntegerField(choices=Type.choices)
     user = models.ForeignKey('users.User', on_delete=models.SET_NULL, null=True)
     project = models.ForeignKey('projects.Project', on_delete=models.CASCADE, related_name='record')
+    count = models.PositiveIntegerField(default=1)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['project', 'created_at'])]
+
+
+class Contribution(models.Model):
+    # Per user and day: translations created (edits of existing ones are not counted, as they
+    # can't be attributed in the version history) and translations marked as reviewed.
+    user = models.ForeignKey('users.User', on_delete=models.CASCADE, related_name='contributions')
+    project = models.ForeignKey('projects.Project', on_delete=models.CASCADE, related_name='contributions')
+    date = models.DateField()
+    translation_count = models.IntegerField(default=0)
+    reviewed_count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('user', 'project', 'date')
+
+    @staticmethod
+    def add(user, project, translation_count: int = 0, reviewed_count: int = 0):
+        if not user or not (translation_count or reviewed_count):
+            return
+        filters = {'user': user, 'project': project, 'date': timezone.localdate()}
+        updates = {
+            'translation_count': F('translation_count') + translation_count,
+            'reviewed_count': F('reviewed_count') + reviewed_count
+        }
+        if Contribution.objects.filter(**filters).update(**updates):
+            return
+        try:
+            with transaction.atomic():
+                Contribution.objects.create(translation_count=translation_count, reviewed_count=reviewed_count, **filters)
+        except IntegrityError:
+            Contribution.objects.filter(**filters).update(**updates)
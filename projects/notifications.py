@@ -0,0 +1,125 @@
+import asyncio, json, logging
+from threading import Lock, Thread
+from django.db import transaction
+from channels.layers import get_channel_layer
+from asgiref.sync import async_to_sync
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+pending = []
+lock = Lock()
+dispatching = False
+event_loop = None
+
+
+def set_event_loop(loop: asyncio.AbstractEventLoop):
+    # The in-memory channel layer wakes consumers through asyncio queues, which only works from the
+    # loop the consumers run on, so group sends are handed over to that loop.
+    global event_loop
+    event_loop = loop
+
+
+def send_notification(project_id: int, type: str, data, after_commit: bool = True):
+    event = (project_id, type, data)
+    if after_commit:
+        transaction.on_commit(lambda: enqueue(event))
+    else:
+        enqueue(event)
+
+
+def enqueue(event: tuple):
+    global dispatching
+    with lock:
+        pending.append(event)
+        if dispatching:
+            return
+        dispatching = True
+    start_dispatcher()
+
+
+def start_dispatcher():
+    Thread(target=dispatch, name='notification-dispatcher', daemon=True).start()
+
+
+def language_ids(type: str, data) -> list:
+    if type.endswith('.language'):
+        return [data['id']]
+    if type.endswith('.languages'):
+        return [language['id'] for language in data]
+    return []
+
+
+def merge_events(events: list) -> list:
+    # Language events are merged into the earlier event of the same kind, which keeps its position.
+    # That is only done while no event in between carries one of the same languages, so clients
+    # never apply older counts after newer ones.
+    merged = []
+    positions = {}
+    touched = {}
+    for project_id, type, data in events:
+        ids = language_ids(type, data)
+        key = (project_id, type, data['id'] if type.endswith('.language') else None)
+        index = positions.get(key) if ids else None
+        if index is not None and all(touched.get((project_id, id), -1) <= index for id in ids):
+            if type.endswith('.languages'):
+                languages = {language['id']: language for language in merged[index][2]}
+                languages.update((language['id'], language) for language in data)
+                data = list(languages.values())
+            merged[index] = (project_id, type, data)
+        else:
+            index = len(merged)
+            merged.append((project_id, type, data))
+            if ids:
+                positions[key] = index
+        for id in ids:
+            touched[(project_id, id)] = index
+    return merged
+
+
+def get_group_names(project_id: int) -> dict:
+    groups = {'json': f'project_{project_id}'}
+    if msgpack:
+        groups['msgpack'] = f'project_{project_id}_msgpack'
+    return groups
+
+
+def encode_event(type: str, data, encoding: str = 'json') -> dict:
+    payload = {'type': type, 'data': data}
+    if encoding == 'msgpack':
+        return {'type': 'send_notification', 'bytes': msgpack.packb(payload)}
+    return {'type': 'send_notification', 'text': json.dumps(payload)}
+
+
+def group_send(channel_layer, group: str, event: dict):
+    loop = event_loop
+    if loop and loop.is_running():
+        asyncio.run_coroutine_threadsafe(channel_layer.group_send(group, event), loop).result()
+    else:
+        async_to_sync(channel_layer.group_send)(group, event)
+
+
+def dispatch():
+    global dispatching
+    while True:
+        with lock:
+            events = merge_events(pending)
+            pending.clear()
+            if not events:
+                dispatching = False
+                return
+        channel_layer = get_channel_layer()
+        for index, (project_id, type, data) in enumerate(events):
+            try:
+                for encoding, group in get_group_names(project_id).items():
+                    group_send(channel_layer, group, encode_event(type, data, encoding))
+            except Exception:
+                logger.exception('Failed to send %s notification for project %s.', type, project_id)
+                with lock:
+                    pending[:0] = events[index:]
+                    dispatching = False
+                return
@@ -1,22 +1,32 @@
 from rest_framework.permissions import BasePermission
 from projects.models import Collaborator, Project
+from projects.roles import get_request_roles
+
+
+def get_project_id(obj):
+    if hasattr(obj, 'project_id'):
+        return obj.project_id
+    elif hasattr(obj, 'key'):
+        return obj.key.project_id
+    elif hasattr(obj, 'translation'):
+        return obj.translation.key.project_id
+    return None
 
 
 class HasProjectPermission(BasePermission):
     def has_object_permission(self, request, view, obj):
         if not isinstance(obj, Project):
             return False
-        
-        if obj.created_by == request.user:
-            return True
-        
-        try:
-            collaborator = Collaborator.objects.get(user=request.user, project=obj)
-        except Collaborator.DoesNotExist:
+
+        roles = get_request_roles(request, obj.id)
+        if not roles:
             return False
 
+        if roles['is_owner']:
+            return True
+
         if view.action in ['update', 'partial_update']:
-            return Collaborator.Role.ADMIN in collaborator.roles
+            return Collaborator.Role.ADMIN in roles['roles']
         
         return True
 
@@ -28,44 +38,31 @@ class ProjectRolePermission(BasePermission):
         project_id = view.kwargs.get('project_pk', None)
         if not project_id:
             return False
-        
-        try:
-            project = Project.objects.get(id=project_id)
-        except Project.DoesNotExist:
-            return False
-        
-        return self.has_role_permission(view.action, 'list', project, request.user)
+
+        return self.has_role_permission(view.action, 'list', project_id, request)
 
 
     def has_object_permission(self, request, view, obj):
-        project = None
-        if hasattr(obj, 'project'):
-            project = obj.project
-        elif hasattr(obj, 'key'):
-            project = obj.key.project
-        elif hasattr(obj, 'translation'):
-            project = obj.translation.key.project
-
-        if not project:
+        project_id = get_project_id(obj)
+        if not project_id:
             return False
 
-        return self.has_role_permission(view.action, 'retrieve', project, request.user)
+        return self.has_role_permission(view.action, 'retrieve', project_id, request)
 
 
-    def has_role_permission(self, action, action_name,  project, user):
-        if project.created_by == user:
-            return True
-
-        try:
-            collaborator = Collaborator.objects.get(user=user, project=project)
-        except Collaborator.DoesNotExist:
+    def has_role_permission(self, action, action_name, project_id, request):
+        roles = get_request_roles(request, project_id)
+        if not roles:
             return False
 
+        if roles['is_owner']:
+            return True
+
         if action == action_name:
             return True
 
         for role in self.allowed_roles:
-            if role in collaborator.roles:
+            if role in roles['roles']:
                 return True
         return False
 
@@ -83,4 +80,4 @@ class IsAdminOrReviewer(ProjectRolePermission):
     allowed_roles = [Collaborator.Role.ADMIN, Collaborator.Role.REVIEWER]
 
 class IsAnyRole(ProjectRolePermission):
-    allowed_roles = [Collaborator.Role.ADMIN, Collaborator.Role.DEVELOPER, Collaborator.Role.TRANSLATOR, Collaborator.Role.REVIEWER]
\ No newline at end of file
+    allowed_roles = [Collaborator.Role.ADMIN, Collaborator.Role.DEVELOPER, Collaborator.Role.TRANSLATOR, Collaborator.Role.REVIEWER]
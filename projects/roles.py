@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import OuterRef, Subquery
+
+from .models import Collaborator, Project
+
+missing = object()
+
+
+def get_cache_key(user_id: int, project_id: int) -> str:
+    return f'project_roles:{project_id}:{user_id}'
+
+
+def load_roles(user_id: int, project_id: int):
+    project = Project.objects.filter(id=project_id).annotate(roles=Subquery(
+        Collaborator.objects.filter(project=OuterRef('id'), user=user_id).values('roles')[:1]
+    )).values('created_by', 'roles').first()
+    if not project:
+        return None
+    is_owner = project['created_by'] == user_id
+    if not is_owner and project['roles'] is None:
+        return None
+    return {'is_owner': is_owner, 'roles': project['roles'] or []}
+
+
+def get_user_roles(user_id: int, project_id):
+    if not str(project_id).isdigit():
+        return None
+    project_id = int(project_id)
+    key = get_cache_key(user_id, project_id)
+    roles = cache.get(key, missing)
+    if roles is missing:
+        roles = load_roles(user_id, project_id)
+        cache.set(key, roles, settings.ROLE_CACHE_TIMEOUT)
+    return roles
+
+
+def get_request_roles(request, project_id):
+    if not hasattr(request, 'project_roles'):
+        request.project_roles = {}
+    project_id = str(project_id)
+    if project_id not in request.project_roles:
+        request.project_roles[project_id] = get_user_roles(request.user.id, project_id)
+    return request.project_roles[project_id]
+
+
+def invalidate_roles(project_id: int, user_ids):
+    cache.delete_many([get_cache_key(user_id, project_id) for user_id in user_ids])
@@ -4,7 +4,7 @@ from rest_framework.serializers import ModelSerializer, CharField, ListField
 
 from utils.language_util import LanguageUtil
 
-from .models import Language, Project, Collaborator, Record
+from .models import Language, LanguageRemovalJob, Project, Collaborator, Record
 from users.serializers import UserDetailSerializer
 
 
@@ -41,6 +41,12 @@ class LanguageSerializer(ModelSerializer):
         fields = '__all__'
 
 
+class LanguageRemovalJobSerializer(ModelSerializer):
+    class Meta:
+        model = LanguageRemovalJob
+        exclude = ['last_id']
+
+
 class ProjectSerializer(ModelSerializer):
     created_by = UserDetailSerializer(many=False, read_only=True)
     collaborators = CollaboratorSerializer(many=True, read_only=True)
@@ -50,7 +56,15 @@ class ProjectSerializer(ModelSerializer):
     class Meta:
         model = Project
         fields = '__all__'
-        read_only_fields = ['id', 'created_by', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_by', 'revision', 'created_at', 'updated_at']
+
+    def update(self, instance, validated_data):
+        validated_data.pop('language_codes', None)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=[*validated_data, 'updated_at'])
+        instance.refresh_from_db(fields=['revision'])
+        return instance
 
     def validate_main_language(self, value):
         if not value in LanguageUtil.language_codes:
@@ -1,17 +1,24 @@
+from datetime import timedelta
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework.viewsets import ModelViewSet, GenericViewSet
 from rest_framework.mixins import ListModelMixin, CreateModelMixin, UpdateModelMixin, DestroyModelMixin
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Q
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
+from rest_framework.exceptions import ValidationError
+from django.db.models import Q, Sum
 
-from .models import Language, Project, Collaborator, Record
+from .jobs import remove_languages
+from .pagination import RecordPagination
+from .models import Contribution, Language, LanguageRemovalJob, Project, Collaborator, Record
+from .notifications import send_notification
 from .serializers import CollaboratorSerializer, ProjectDetailSerializer, ProjectSerializer, CollaboratorCreateSerializer, RecordSerializer
 from .permissions import HasProjectPermission, IsAdmin, IsAnyRole
-from users.models import Notification
+from .roles import invalidate_roles
+from users.models import Notification, User
+from users.serializers import UserDetailSerializer
 
 
 class ProjectViewSet(ModelViewSet):
@@ -31,17 +38,7 @@ class ProjectViewSet(ModelViewSet):
         return Project.objects.filter(base_filter)
 
     def send_notification(self, project_id: int, type: str, data):
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            f'project_{project_id}',
-            {
-                'type': 'send_notification',
-                'data': {
-                    'type': f'project.{type}',
-                    'data': data
-                }
-            }
-        )
+        send_notification(project_id, f'project.{type}', data)
 
     def perform_create(self, serializer):
         languages = serializer.validated_data.pop('language_codes')
@@ -63,12 +60,17 @@ class ProjectViewSet(ModelViewSet):
             else:
                 languages.append(instance.main_language)
             actual_languages = instance.get_language_codes()
-            for lang in actual_languages:
-                if not lang in languages:
-                    instance.languages.get(code=lang).delete()
-                    keys = instance.keys.all()
-                    for key in keys:
-                        key.translations.filter(language=lang).delete()
+            removing = LanguageRemovalJob.pending_languages(instance.id).intersection(languages).difference(actual_languages)
+            if removing:
+                raise ValidationError({'language_codes': f'Languages still being removed: {", ".join(sorted(removing))}.'})
+            if set(actual_languages) != set(languages):
+                instance.advance_revision()
+            removed_languages = [lang for lang in actual_languages if not lang in languages]
+            if removed_languages:
+                removed = instance.languages.filter(code__in=removed_languages)
+                total = removed.aggregate(total=Sum('translation_count'))['total'] or 0
+                removed.delete()
+                remove_languages(instance.id, removed_languages, total)
             for lang in set(languages):
                 if not lang in actual_languages:
                     Language.objects.create(
@@ -82,12 +84,16 @@ class ProjectViewSet(ModelViewSet):
         user = self.request.user
         if instance.created_by == user:
             self.send_notification(project_id=instance.id, type='destroy', data=instance.id)
+            user_ids = [instance.created_by_id, *instance.collaborators.values_list('user', flat=True)]
+            project_id = instance.id
             instance.delete()
+            invalidate_roles(project_id, user_ids)
         else:
             collaborator = instance.collaborators.get(user=user)
             collaborator.user.notifications.filter(project=instance).delete()
             self.send_notification(project_id=instance.id, type='collab', data=collaborator.id)
             collaborator.delete()
+            invalidate_roles(instance.id, [user.id])
 
     def get_serializer_class(self):
         if self.action in ['list', 'collab']:
@@ -104,6 +110,41 @@ class ProjectViewSet(ModelViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['GET'])
+    def stats(self, request, *args, **kwargs):
+        project = self.get_object()
+        key_count = project.keys.count()
+        languages = []
+        for language in project.languages.order_by('code'):
+            languages.append({
+                'code': language.code,
+                'translation_count': language.translation_count,
+                'reviewed_count': language.reviewed_count,
+                'completion': round(language.translation_count * 100 / key_count, 2) if key_count else 0,
+                'review': round(language.reviewed_count * 100 / key_count, 2) if key_count else 0,
+            })
+        contributions = Contribution.objects.filter(project=project)
+        contributors = list(contributions.values('user').annotate(
+            translation_count=Sum('translation_count'),
+            reviewed_count=Sum('reviewed_count')
+        ).order_by('-translation_count', 'user'))
+        users = User.objects.in_bulk([contributor['user'] for contributor in contributors])
+        for contributor in contributors:
+            contributor['user'] = UserDetailSerializer(users[contributor['user']]).data
+        days = request.query_params.get('days', '')
+        days = min(max(int(days), 1), 365) if days.isdigit() else 30
+        since = timezone.localdate() - timedelta(days=days - 1)
+        velocity = contributions.filter(date__gte=since).values('date').annotate(
+            translation_count=Sum('translation_count'),
+            reviewed_count=Sum('reviewed_count')
+        ).order_by('date')
+        return Response({
+            'key_count': key_count,
+            'languages': languages,
+            'contributors': contributors,
+            'velocity': list(velocity),
+        })
+
 
 class CollaboratorViewSet(GenericViewSet, CreateModelMixin, UpdateModelMixin, DestroyModelMixin):
     permission_classes = [IsAuthenticated, IsAdmin]
@@ -117,17 +158,7 @@ class CollaboratorViewSet(GenericViewSet, CreateModelMixin, UpdateModelMixin, De
         return CollaboratorSerializer
 
     def send_notification(self, project_id: int, type: str, data):
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            f'project_{project_id}',
-            {
-                'type': 'send_notification',
-                'data': {
-                    'type': f'collaborator.{type}',
-                    'data': data
-                }
-            }
-        )
+        send_notification(project_id, f'collaborator.{type}', data)
 
     def perform_create(self, serializer):
         project = get_object_or_404(Project, id=self.kwargs['project_pk'])
@@ -137,6 +168,7 @@ class CollaboratorViewSet(GenericViewSet, CreateModelMixin, UpdateModelMixin, De
             project=project
         )
         serializer.save(project=project)
+        invalidate_roles(project.id, [serializer.instance.user_id])
         collaborator = CollaboratorSerializer(serializer.instance)
         self.send_notification(project_id=project.id, type='create', data=collaborator.data)
 
@@ -145,16 +177,41 @@ class CollaboratorViewSet(GenericViewSet, CreateModelMixin, UpdateModelMixin, De
         instance.user.notifications.filter(project=project).delete()
         self.send_notification(project_id=project.id, type='destroy', data=instance.id)
         instance.delete()
+        invalidate_roles(project.id, [instance.user_id])
 
     def perform_update(self, serializer):
         serializer.save()
+        invalidate_roles(serializer.instance.project_id, [serializer.instance.user_id])
         self.send_notification(project_id=serializer.instance.project.id, type='update', data=serializer.data)
 
 
 class RecordViewSet(GenericViewSet, ListModelMixin):
     serializer_class = RecordSerializer
     permission_classes = [IsAuthenticated, IsAnyRole]
-    pagination_class = None
+    pagination_class = RecordPagination
 
     def get_queryset(self):
-        return Record.objects.filter(project=self.kwargs['project_pk'])
\ No newline at end of file
+        queryset = Record.objects.filter(project=self.kwargs['project_pk']).select_related('user')
+        types = self.request.query_params.getlist('type')
+        if types:
+            if not all(type.isdigit() for type in types):
+                raise ValidationError({'type': 'Record types must be integers.'})
+            queryset = queryset.filter(type__in=types)
+        user = self.request.query_params.get('user')
+        if user:
+            if not user.isdigit():
+                raise ValidationError({'user': 'The user must be an id.'})
+            queryset = queryset.filter(user=user)
+        for param, lookup in [('since', 'created_at__gte'), ('until', 'created_at__lt')]:
+            value = self.request.query_params.get(param)
+            if value:
+                try:
+                    date = parse_datetime(value)
+                except ValueError:
+                    date = None
+                if not date:
+                    raise ValidationError({param: 'Invalid datetime.'})
+                if timezone.is_naive(date):
+                    date = timezone.make_aware(date)
+                queryset = queryset.filter(**{lookup: date})
+        return queryset
\ No newline at end of file
@@ -0,0 +1,28 @@
+from difflib import SequenceMatcher
+
+
+def diff(source: str, target: str) -> list:
+    delta = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, source, target, autojunk=False).get_opcodes():
+        if tag == 'equal':
+            delta.append(i2 - i1)
+            continue
+        if i2 > i1:
+            delta.append(i1 - i2)
+        if j2 > j1:
+            delta.append(target[j1:j2])
+    return delta
+
+
+def patch(source: str, delta: list) -> str:
+    parts = []
+    position = 0
+    for op in delta:
+        if isinstance(op, str):
+            parts.append(op)
+        elif op > 0:
+            parts.append(source[position:position + op])
+            position += op
+        else:
+            position -= op
+    return ''.join(parts)
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('translations', '0003_alter_translation_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='version',
+            name='chain',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='version',
+            name='delta',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='version',
+            name='text',
+            field=models.TextField(blank=True),
+        ),
+    ]
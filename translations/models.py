@@ -1,6 +1,11 @@
+import json
 from datetime import datetime
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 
+from .deltas import diff, patch
+from .search import text_vector
+
 
 class Translation(models.Model):
     text = models.TextField()
@@ -15,17 +20,53 @@ class Translation(models.Model):
 
     class Meta:
         unique_together = ('key', 'language')
+        indexes = [GinIndex(text_vector(), name='translation_text_search_idx')]
 
     def __str__(self):
         return self.text
 
 
 class Version(models.Model):
-    text = models.TextField()
+    snapshot_interval = 20
+
+    text = models.TextField(blank=True)
+    delta = models.JSONField(null=True, blank=True)
+    chain = models.PositiveIntegerField(default=0)
     translation = models.ForeignKey('translations.Translation', on_delete=models.CASCADE, related_name='versions')
     created_by = models.ForeignKey('users.User', on_delete=models.SET_NULL, null=True)
     created_at = models.DateTimeField()
 
+    def compress(self, newer_text: str, chain: int):
+        delta = diff(newer_text, self.text)
+        if chain < Version.snapshot_interval and len(json.dumps(delta, ensure_ascii=False)) < len(self.text):
+            self.text = ''
+            self.delta = delta
+            self.chain = chain + 1
+
+    @staticmethod
+    def latest_chains(translation_ids) -> dict:
+        if not translation_ids:
+            return {}
+        versions = Version.objects.filter(translation__in=translation_ids).order_by('translation', '-id').distinct('translation')
+        return dict(versions.values_list('translation', 'chain'))
+
+    @staticmethod
+    def rebuild(translation: Translation, versions: list):
+        if not versions:
+            return
+        newer_versions = []
+        if versions[0].delta is not None:
+            newer = translation.versions.filter(id__gt=versions[0].id).order_by('id').only('text', 'delta')
+            for version in newer[:Version.snapshot_interval + 1]:
+                newer_versions.append(version)
+                if version.delta is None:
+                    break
+        text = translation.text
+        for version in newer_versions[::-1] + list(versions):
+            if version.delta is not None:
+                version.text = patch(text, version.delta)
+            text = version.text
+
 
 class Comment(models.Model):
     text = models.TextField()
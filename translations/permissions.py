@@ -1,6 +1,7 @@
 from rest_framework.permissions import BasePermission
 
 from projects.models import Collaborator
+from projects.roles import get_request_roles
 from .models import Comment
 
 
@@ -10,15 +11,11 @@ class IsCommentOwner(BasePermission):
             return False
         
         if view.action == 'destroy':
-            project = obj.translation.key.project
-            if project.created_by == request.user:
-                return True
-
-            collaborator = Collaborator.objects.filter(user=request.user, project=project)
-            if Collaborator.Role.ADMIN in collaborator.roles:
+            roles = get_request_roles(request, obj.translation.key.project_id)
+            if roles and (roles['is_owner'] or Collaborator.Role.ADMIN in roles['roles']):
                 return True
 
         if view.action in ['update', 'partial_update', 'destroy']:
-            return obj.created_by == request.user
+            return obj.created_by_id == request.user.id
 
         return True
\ No newline at end of file
@@ -0,0 +1,18 @@
+import re
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db.models import F, Func, Value
+
+
+def name_vector(field: str = 'name') -> SearchVector:
+    return SearchVector(Func(F(field), Value('.-_'), Value('   '), function='translate'), config='simple')
+
+
+def text_vector(field: str = 'text') -> SearchVector:
+    return SearchVector(field, config='simple')
+
+
+def search_query(text: str):
+    terms = re.findall(r'\w+', text.lower())
+    if not terms:
+        return None
+    return SearchQuery(' & '.join(f'{term}:*' for term in terms), config='simple', search_type='raw')
@@ -1,6 +1,6 @@
 from django.forms import ValidationError
 from django.shortcuts import get_object_or_404
-from rest_framework.serializers import ModelSerializer, BooleanField, CharField
+from rest_framework.serializers import ModelSerializer, BooleanField, CharField, FloatField
 
 from projects.models import Project
 
@@ -59,12 +59,21 @@ class TranslationDetailSerializer(ModelSerializer):
         fields = '__all__'
 
 
+class TranslationSearchSerializer(ModelSerializer):
+    key_name = CharField(source='key.name', read_only=True)
+    rank = FloatField(read_only=True)
+
+    class Meta:
+        model = Translation
+        fields = ['id', 'key', 'key_name', 'language', 'text', 'is_reviewed', 'rank']
+
+
 class VersionSerializer(ModelSerializer):
     created_by = UserDetailSerializer(many=False, read_only=True)
 
     class Meta:
         model = Version
-        fields = '__all__'
+        exclude = ['delta', 'chain']
 
 
 class CommentSerializer(ModelSerializer):
@@ -1,3 +1,93 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from keys.importer import KeyImporter
+from keys.models import Key
+from projects.models import Language, Project
+from users.models import User
+from .models import Translation, Version
+
+
+class VersionHistoryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(email='owner@example.com', first_name='Owner', last_name='User')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        project = Project.objects.create(name='Project', created_by=self.user, main_language='en')
+        Language.objects.create(code='en', project=project)
+        key = Key.objects.create(name='legal.terms', project=project, created_by=self.user)
+        self.translation = Translation.objects.create(text=self.text(0), language='en', key=key, created_by=self.user)
+        self.url = f'/projects/{project.id}/keys/{key.id}/translations/{self.translation.id}/'
+
+    def text(self, revision: int) -> str:
+        if revision % 17 == 16:
+            return f'Completely rewritten terms, revision {revision}.'
+        return f'By using this application you agree to the terms of service, revision {revision}. Thank you!'
+
+    def edit(self, text: str):
+        response = self.client.patch(self.url, {'text': text}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def read_history(self, page_size: int) -> list:
+        texts = []
+        response = self.client.get(self.url + 'versions/', {'page_size': page_size})
+        while True:
+            self.assertEqual(response.status_code, 200, response.content)
+            data = response.json()
+            self.assertLessEqual(len(data['results']), page_size)
+            texts.extend(version['text'] for version in data['results'])
+            if not data['next']:
+                return texts
+            response = self.client.get(data['next'])
+
+    def test_history_longer_than_snapshot_interval(self):
+        texts = [self.text(0)]
+        for revision in range(1, Version.snapshot_interval * 3 + 5):
+            texts.append(self.text(revision))
+            self.edit(texts[-1])
+        versions = list(Version.objects.filter(translation=self.translation).order_by('id'))
+        self.assertEqual(len(versions), len(texts) - 1)
+        self.assertGreater(sum(version.delta is None for version in versions), 2)
+        self.assertTrue(any(version.delta is not None for version in versions))
+        self.assertLessEqual(max(version.chain for version in versions), Version.snapshot_interval)
+        for page_size in [1, 3, 7, Version.snapshot_interval, Version.snapshot_interval + 1, 100]:
+            with self.subTest(page_size=page_size):
+                self.assertEqual(self.read_history(page_size), texts[-2::-1])
+
+    def test_history_with_full_text_versions(self):
+        texts = [f'Legacy terms text, stored before deltas existed, number {index}.' for index in range(3)]
+        for text in texts:
+            Version.objects.create(text=text, translation=self.translation, created_by=self.user, created_at=timezone.now())
+        Translation.objects.filter(id=self.translation.id).update(text=self.text(0))
+        texts.append(self.text(0))
+        for revision in range(1, Version.snapshot_interval + 5):
+            texts.append(self.text(revision))
+            self.edit(texts[-1])
+        for page_size in [2, 5, Version.snapshot_interval]:
+            with self.subTest(page_size=page_size):
+                self.assertEqual(self.read_history(page_size), texts[-2::-1])
+
+    def test_deep_pages_load_one_delta_run(self):
+        for revision in range(1, Version.snapshot_interval * 4 + 1):
+            self.edit(self.text(revision))
+        oldest = Version.objects.filter(translation=self.translation).order_by('id')[:2]
+        response = self.client.get(self.url + 'versions/', {'page_size': 2})
+        while response.json()['next']:
+            url = response.json()['next']
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+        self.assertEqual([version['id'] for version in response.json()['results']], [version.id for version in oldest][::-1])
+        newer = [query['sql'] for query in context.captured_queries if '"translations_version"."id" >' in query['sql']]
+        self.assertEqual(len(newer), 1)
+        self.assertIn(f'LIMIT {Version.snapshot_interval + 1}', newer[0])
+
+    def test_import_after_concurrent_edit(self):
+        importer = KeyImporter(self.translation.key.project, self.user)
+        importer.add('en', [('legal.terms', self.text(2))])
+        self.edit(self.text(1))
+        importer.save()
+        texts = [self.text(0), self.text(1), self.text(2)]
+        self.assertEqual(self.read_history(10), texts[-2::-1])
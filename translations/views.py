@@ -5,15 +5,21 @@ from rest_framework.mixins import ListModelMixin, CreateModelMixin, UpdateModelM
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
+from rest_framework.exceptions import ValidationError
+from django.contrib.postgres.search import SearchRank
+from django.db import transaction
+from django.db.models.functions import Greatest
 
 from keys.models import Key
 from projects.serializers import LanguageSerializer
 from .permissions import IsCommentOwner
 from .models import Translation, Version, Comment
-from projects.models import Language, Record
-from .serializers import TranslationCreateSerializer, TranslationReviewSerializer, TranslationSerializer, VersionSerializer, CommentSerializer
+from .pagination import SearchPagination, VersionPagination
+from .search import name_vector, search_query, text_vector
+from projects.audit import AuditLog
+from projects.models import Contribution, Language, Record
+from projects.notifications import send_notification
+from .serializers import TranslationCreateSerializer, TranslationReviewSerializer, TranslationSearchSerializer, TranslationSerializer, VersionSerializer, CommentSerializer
 from projects.permissions import IsAdminOrTranslator, IsAnyRole
 
 
@@ -21,7 +27,7 @@ class TranslationViewSet(GenericViewSet, CreateModelMixin, UpdateModelMixin):
     permission_classes = [IsAuthenticated, IsAdminOrTranslator]
 
     def get_queryset(self):
-        return Translation.objects.filter(key=self.kwargs['key_pk'])
+        return Translation.objects.filter(key=self.kwargs['key_pk']).select_related('key')
 
     def get_serializer_class(self):
         if self.action == 'review':
@@ -31,24 +37,15 @@ class TranslationViewSet(GenericViewSet, CreateModelMixin, UpdateModelMixin):
         return TranslationSerializer
 
     def send_notification(self, project_id: int, type: str, data):
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            f'project_{project_id}',
-            {
-                'type': 'send_notification',
-                'data': {
-                    'type': f'translation.{type}',
-                    'data': data
-                }
-            }
-        )
+        send_notification(project_id, f'translation.{type}', data)
 
     def perform_create(self, serializer):
         key = get_object_or_404(Key, id=self.kwargs['key_pk'])
         language = Language.objects.get(project=key.project, code=serializer.validated_data.get('language'))
-        language.translation_count += 1
-        language.save()
+        language.update_counts(translation_count=1)
         serializer.save(key=key, created_by=self.request.user)
+        Contribution.add(self.request.user, key.project, translation_count=1)
+        key.project.advance_revision()
         self.send_notification(project_id=key.project.id, type='language', data=LanguageSerializer(language).data)
         self.send_notification(project_id=key.project.id, type='create', data=serializer.data)
 
@@ -58,40 +55,36 @@ class TranslationViewSet(GenericViewSet, CreateModelMixin, UpdateModelMixin):
         if self.action == 'review':
             is_reviewed = self.request.data.get('is_reviewed')
             if is_reviewed and not instance.is_reviewed:
-                Record.objects.create(
-                    type=6,
-                    user=self.request.user,
-                    project=instance.key.project
-                )
-                language.reviewed_count += 1
-                language.save()
+                AuditLog.of(self.request).add(Record.Type.REVIEW_TRANSLATION, self.request.user, instance.key.project)
+                language.update_counts(reviewed_count=1)
+                Contribution.add(self.request.user, instance.key.project, reviewed_count=1)
                 serializer.save(reviewed_by=self.request.user, reviewed_at=datetime.now())
             elif not is_reviewed and instance.is_reviewed:
-                language.reviewed_count -= 1
-                language.save()
+                language.update_counts(reviewed_count=-1)
                 serializer.save(reviewed_by=None, reviewed_at=None)
         else:
-            Version.objects.create(
-                text=instance.text,
-                translation=instance,
-                created_by=instance.created_by,
-                created_at=instance.updated_at
-            )
-            Record.objects.create(
-                type=5,
-                user=self.request.user,
-                project=instance.key.project
-            )
-            if instance.is_reviewed:
-                language.reviewed_count -= 1
-                language.save()
-            serializer.save(
-                is_reviewed=False,
-                reviewed_at=None,
-                reviewed_by=None,
-                updated_at=datetime.now()
-            )
+            with transaction.atomic():
+                # The delta is taken against the saved text, so the row stays locked until the new text is written.
+                current = Translation.objects.select_for_update().get(id=instance.id)
+                version = Version(
+                    text=current.text,
+                    translation=current,
+                    created_by_id=current.created_by_id,
+                    created_at=current.updated_at
+                )
+                version.compress(serializer.validated_data.get('text', current.text), Version.latest_chains([current.id]).get(current.id, 0))
+                version.save()
+                AuditLog.of(self.request).add(Record.Type.EDIT_TRANSLATION, self.request.user, instance.key.project)
+                if current.is_reviewed:
+                    language.update_counts(reviewed_count=-1)
+                serializer.save(
+                    is_reviewed=False,
+                    reviewed_at=None,
+                    reviewed_by=None,
+                    updated_at=datetime.now()
+                )
             self.send_notification(project_id=instance.key.project.id, type='version', data=self.get_serializer(instance).data)
+        instance.key.project.advance_revision()
         self.send_notification(project_id=instance.key.project.id, type='language', data=LanguageSerializer(language).data)
         self.send_notification(project_id=instance.key.project.id, type='update', data=serializer.data)
 
@@ -106,13 +99,43 @@ class TranslationViewSet(GenericViewSet, CreateModelMixin, UpdateModelMixin):
         return Response(serializer.data)
 
 
+class TranslationSearchViewSet(GenericViewSet, ListModelMixin):
+    serializer_class = TranslationSearchSerializer
+    permission_classes = [IsAuthenticated, IsAnyRole]
+    pagination_class = SearchPagination
+
+    def get_queryset(self):
+        query = search_query(self.request.query_params.get('q', ''))
+        if not query:
+            raise ValidationError({'q': 'A search term is required.'})
+        translations = Translation.objects.filter(key__project=self.kwargs['project_pk'])
+        languages = self.request.query_params.getlist('language')
+        if languages:
+            translations = translations.filter(language__in=languages)
+        # Each branch can use its own search index; OR-ing them in one WHERE clause forces a scan.
+        text_matches = translations.annotate(search=text_vector()).filter(search=query).values('id')
+        name_matches = translations.annotate(search=name_vector('key__name')).filter(search=query).values('id')
+        queryset = Translation.objects.filter(id__in=text_matches.union(name_matches))
+        return queryset.select_related('key').annotate(rank=Greatest(
+            SearchRank(text_vector(), query),
+            SearchRank(name_vector('key__name'), query)
+        )).order_by('-rank', 'key__name', 'language')
+
+
 class VersionViewSet(GenericViewSet, ListModelMixin):
     serializer_class = VersionSerializer
     permission_classes = [IsAuthenticated, IsAnyRole]
-    pagination_class = None
+    pagination_class = VersionPagination
 
     def get_queryset(self):
-        return Version.objects.filter(translation=self.kwargs['translation_pk'])
+        return Version.objects.filter(translation=self.kwargs['translation_pk']).select_related('created_by')
+
+    def list(self, request, *args, **kwargs):
+        translation = get_object_or_404(Translation, id=self.kwargs['translation_pk'])
+        page = self.paginate_queryset(self.get_queryset())
+        Version.rebuild(translation, page)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
 
 class CommentViewSet(GenericViewSet, ListModelMixin, CreateModelMixin, UpdateModelMixin, DestroyModelMixin):
@@ -121,20 +144,10 @@ class CommentViewSet(GenericViewSet, ListModelMixin, CreateModelMixin, UpdateMod
     pagination_class = None
 
     def get_queryset(self):
-        return Comment.objects.filter(translation=self.kwargs['translation_pk'])
+        return Comment.objects.filter(translation=self.kwargs['translation_pk']).select_related('translation__key')
 
     def send_notification(self, project_id: int, type: str, data):
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            f'project_{project_id}',
-            {
-                'type': 'send_notification',
-                'data': {
-                    'type': f'comment.{type}',
-                    'data': data
-                }
-            }
-        )
+        send_notification(project_id, f'comment.{type}', data)
 
     def perform_create(self, serializer):
         translation = get_object_or_404(Translation, id=self.kwargs['translation_pk'])
@@ -6,6 +6,7 @@ from rest_framework import status
 from django.db.models import Value
 from django.db.models.functions import Concat
 
+from .authentication import invalidate_user
 from .models import User, Notification
 from .serializers import UserCreateSerializer, UserDetailSerializer, UserSerializer, NotificationSerializer
 
@@ -33,6 +34,15 @@ class UserViewSet(ModelViewSet):
             return super().get_permissions()
         return [] # only for development
 
+    def perform_update(self, serializer):
+        serializer.save()
+        invalidate_user(serializer.instance.id)
+
+    def perform_destroy(self, instance):
+        user_id = instance.id
+        instance.delete()
+        invalidate_user(user_id)
+
     @action(detail=False, methods=['GET', 'PUT', 'PATCH', 'DELETE'])
     def profile(self, request, *args, **kwargs):
         instance = request.user
@@ -0,0 +1,28 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerUtil:
+    executor = None
+
+
+    @staticmethod
+    def submit(function, *args):
+        if not WorkerUtil.executor:
+            WorkerUtil.executor = ThreadPoolExecutor(max_workers=settings.BACKGROUND_WORKERS)
+        return WorkerUtil.executor.submit(WorkerUtil.run, function, *args)
+
+    @staticmethod
+    def run(function, *args):
+        try:
+            return function(*args)
+        except Exception:
+            logger.exception('Background task %s failed.', function.__name__)
+            raise
+        finally:
+            connections.close_all()